@@ -0,0 +1,216 @@
+"""ASGI (asyncio) serving mode for the interactive web frontend.
+
+Exposes the same pages and JSON routes as ``web_app.py`` but awaits upstream
+calls instead of holding a worker thread for each one:
+
+    uvicorn asgi_app:app --port 8000
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterator, Dict, Tuple
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, JSONResponse, Response
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+from starlette.templating import Jinja2Templates
+
+from weather_app.async_api import AsyncOpenWeatherClient
+from weather_app.config import ApiKey, ConfigurationError, Settings, get_settings
+from weather_app.exceptions import LocationNotFoundError, WeatherAppError
+from weather_app.icons import IconStore
+from weather_app.models import BoundingBox
+from weather_app.serialization import (
+    dumps,
+    encode_report,
+    negotiate_encoding,
+    parse_fields,
+    serialize_report,
+)
+
+_ICON_CACHE_CONTROL = "public, max-age=31536000, immutable"
+_SPRITE_CACHE_CONTROL = "public, max-age=86400"
+_FRONTEND_DIR = Path(__file__).resolve().parent / "frontend"
+
+templates = Jinja2Templates(directory=_FRONTEND_DIR / "templates")
+_icon_store = IconStore()
+_clients: Dict[Tuple[ApiKey, ...], AsyncOpenWeatherClient] = {}
+
+
+def _static_url(endpoint: str, *, filename: str) -> str:
+    """Flask-compatible ``url_for('static', filename=...)`` for the shared template."""
+    if endpoint != "static":
+        raise ValueError(f"Unsupported endpoint '{endpoint}'.")
+    return f"/static/{filename}"
+
+
+templates.env.globals["url_for"] = _static_url
+
+
+def _client_for(keys: Tuple[ApiKey, ...]) -> AsyncOpenWeatherClient:
+    """Share one client (and its cache, connection pool and key pool) per key set."""
+    client = _clients.get(keys)
+    if client is None:
+        client = _clients[keys] = AsyncOpenWeatherClient(
+            settings=Settings(api_key=keys[0].value, api_keys=keys)
+        )
+    return client
+
+
+def _error(message: str, status_code: int) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status_code)
+
+
+async def index(request: Request) -> HTMLResponse:
+    try:
+        settings = get_settings()
+    except ConfigurationError as exc:
+        warning = str(exc)
+        settings = None
+    else:
+        warning = None
+
+    return templates.TemplateResponse(
+        request,
+        "index.html",
+        {
+            "default_units": settings.units if settings else "metric",
+            "default_language": settings.language if settings else "en",
+            "warning": warning,
+        },
+    )
+
+
+async def weather_api(request: Request) -> Response:
+    location = request.query_params.get("location", "").strip()
+    units = request.query_params.get("units") or None
+    language = request.query_params.get("language") or None
+
+    if not location:
+        return _error("Location query is required.", 400)
+
+    try:
+        fields = parse_fields(request.query_params.get("fields"))
+        settings = get_settings(units=units, language=language)
+    except (ConfigurationError, ValueError) as exc:
+        return _error(str(exc), 400)
+
+    try:
+        report = await _client_for(settings.keys()).get_weather(
+            location, units=settings.units, language=settings.language
+        )
+    except LocationNotFoundError as exc:
+        return _error(str(exc), 404)
+    except WeatherAppError as exc:
+        return _error(str(exc), 502)
+    except ValueError as exc:
+        return _error(str(exc), 400)
+
+    accepted = negotiate_encoding(request.headers.get("accept-encoding"))
+    body, encoding = encode_report(report, fields, accepted)
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type="application/json", headers=headers)
+
+
+async def region_weather_api(request: Request) -> Response:
+    bbox_param = request.query_params.get("bbox", "").strip()
+    units = request.query_params.get("units") or None
+    language = request.query_params.get("language") or None
+
+    if not bbox_param:
+        return _error("Bounding box is required.", 400)
+
+    try:
+        bbox = BoundingBox.parse(bbox_param)
+        zoom = int(request.query_params.get("zoom", 10))
+        settings = get_settings(units=units, language=language)
+    except (ConfigurationError, ValueError) as exc:
+        return _error(str(exc), 400)
+
+    try:
+        reports = await _client_for(settings.keys()).get_region_weather(
+            bbox, zoom=zoom, units=settings.units, language=settings.language
+        )
+    except WeatherAppError as exc:
+        return _error(str(exc), 502)
+    except ValueError as exc:
+        return _error(str(exc), 400)
+
+    body = dumps({"data": [serialize_report(report) for report in reports]})
+    return Response(body, media_type="application/json")
+
+
+async def icon_sprite(request: Request) -> Response:
+    try:
+        data, _ = await run_in_threadpool(_icon_sprite)
+    except WeatherAppError as exc:
+        return _error(str(exc), 502)
+    return _icon_response(request, data, _SPRITE_CACHE_CONTROL)
+
+
+async def icon_sprite_css(request: Request) -> Response:
+    try:
+        _, layout = await run_in_threadpool(_icon_sprite)
+    except WeatherAppError as exc:
+        return _error(str(exc), 502)
+    css = IconStore.sprite_css(layout, url="/icons/sprite.png")
+    return Response(css, media_type="text/css", headers={"Cache-Control": _SPRITE_CACHE_CONTROL})
+
+
+async def icon(request: Request) -> Response:
+    code = request.path_params["code"].removesuffix(".png")
+    try:
+        # Disk reads and first-time downloads are blocking; keep them off the loop.
+        data = await run_in_threadpool(_icon_store.get, code)
+    except ValueError:
+        return _error(f"Unknown icon '{code}'.", 404)
+    except WeatherAppError as exc:
+        return _error(str(exc), 502)
+    return _icon_response(request, data, _ICON_CACHE_CONTROL)
+
+
+@lru_cache(maxsize=1)
+def _icon_sprite():
+    return _icon_store.sprite()
+
+
+def _icon_response(request: Request, data: bytes, cache_control: str) -> Response:
+    """PNG response with an ETag, answering a matching ``If-None-Match`` with 304."""
+    etag = f'"{hashlib.sha1(data).hexdigest()}"'
+    headers = {"Cache-Control": cache_control, "ETag": etag}
+    if_none_match = request.headers.get("if-none-match", "")
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers=headers)
+    return Response(data, media_type="image/png", headers=headers)
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(_: Starlette) -> AsyncIterator[None]:
+    yield
+    for client in _clients.values():
+        await client.aclose()
+    _clients.clear()
+
+
+app = Starlette(
+    routes=[
+        Route("/", index),
+        Route("/api/weather", weather_api),
+        Route("/api/weather/region", region_weather_api),
+        Route("/icons/sprite.png", icon_sprite),
+        Route("/icons/sprite.css", icon_sprite_css),
+        Route("/icons/{code}", icon),
+        Mount("/static", app=StaticFiles(directory=_FRONTEND_DIR / "static"), name="static"),
+    ],
+    lifespan=_lifespan,
+)
@@ -0,0 +1,98 @@
+"""Time the alert engine over many locations and rules.
+
+Builds synthetic reports in-process (no API key or network access needed)
+and times a full first pass, a pass where nothing changed and a pass where a
+fraction of the locations received new observations:
+
+    python benchmarks/bench_alerts.py --locations 10000 --rules 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from weather_app.alerts import AlertEngine, load_rules  # noqa: E402
+from weather_app.models import WeatherReport  # noqa: E402
+
+_RULES = (
+    "freezing: temperature < 0",
+    "heat: temperature > 35",
+    "wind-chill: feels_like < -10",
+    "gale: wind_speed > 17",
+    "breezy: wind_speed >= 8",
+    "humid: humidity >= 90",
+    "dry: humidity < 20",
+    "low-pressure: pressure < 980",
+    "humidity-spike: humidity rise 20",
+    "cold-snap: temperature drop 8",
+)
+
+
+def _report(index: int, rng: random.Random, when: datetime) -> WeatherReport:
+    return WeatherReport(
+        city=f"City {index}",
+        country="GB",
+        description="Light Rain",
+        temperature=round(rng.uniform(-20, 40), 2),
+        feels_like=round(rng.uniform(-25, 42), 2),
+        humidity=rng.randint(5, 100),
+        pressure=rng.randint(960, 1040),
+        wind_speed=round(rng.uniform(0, 25), 2),
+        icon="10d",
+        timestamp=when,
+    )
+
+
+def _timed(engine: AlertEngine, reports: dict) -> tuple[float, int]:
+    started = time.perf_counter()
+    alerts = engine.evaluate(reports)
+    return time.perf_counter() - started, len(alerts)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--locations", type=int, default=10_000, help="Monitored locations.")
+    parser.add_argument(
+        "--rules", type=int, default=len(_RULES), help=f"Rules to apply (at most {len(_RULES)})."
+    )
+    parser.add_argument(
+        "--changed", type=float, default=0.1, help="Fraction of locations updated between passes."
+    )
+    args = parser.parse_args(argv)
+
+    rng = random.Random(42)
+    now = datetime.now(tz=timezone.utc)
+    reports = {f"city {i}": _report(i, rng, now) for i in range(args.locations)}
+    rules = load_rules(_RULES[: args.rules])
+    engine = AlertEngine(rules)
+
+    print(f"{args.locations} locations x {len(rules)} rules = {args.locations * len(rules)} location-rules")
+    print(f"{'pass':<28}{'changed':>10}{'alerts':>10}{'ms':>10}")
+
+    elapsed, fired = _timed(engine, reports)
+    print(f"{'initial (all new)':<28}{len(reports):>10}{fired:>10}{elapsed * 1000:>10.1f}")
+
+    elapsed, fired = _timed(engine, reports)
+    print(f"{'unchanged':<28}{0:>10}{fired:>10}{elapsed * 1000:>10.1f}")
+
+    later = now + timedelta(minutes=10)
+    updated = dict(reports)
+    changed_keys = rng.sample(sorted(reports), int(len(reports) * args.changed))
+    for key in changed_keys:
+        index = int(key.split()[-1])
+        updated[key] = replace(_report(index, rng, later), city=reports[key].city)
+    elapsed, fired = _timed(engine, updated)
+    print(f"{'incremental':<28}{len(changed_keys):>10}{fired:>10}{elapsed * 1000:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
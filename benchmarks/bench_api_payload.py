@@ -0,0 +1,104 @@
+"""Compare /api/weather payload size and server CPU time across response modes.
+
+Runs entirely in-process against the Flask test client with a canned
+upstream payload, so no API key or network access is required:
+
+    python benchmarks/bench_api_payload.py --requests 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("OPENWEATHER_API_KEY", "benchmark")
+
+import requests  # noqa: E402
+
+import web_app  # noqa: E402
+from weather_app.api import OpenWeatherClient  # noqa: E402
+from weather_app.config import Settings  # noqa: E402
+from weather_app.serialization import ENCODERS, serialize_report  # noqa: E402
+
+_PAYLOAD = {
+    "id": 2643743,
+    "name": "London",
+    "dt": 1700000000,
+    "sys": {"country": "GB"},
+    "main": {"temp": 11.3, "feels_like": 10.2, "humidity": 81, "pressure": 1012},
+    "wind": {"speed": 4.6},
+    "weather": [{"description": "light rain", "icon": "10d"}],
+}
+
+_SCENARIOS = (
+    ("legacy jsonify (baseline)", None, {}),
+    ("full, identity", "", {}),
+    ("full, gzip", "", {"Accept-Encoding": "gzip"}),
+    ("full, br", "", {"Accept-Encoding": "br"}),
+    ("fields=temperature,icon", "&fields=temperature,icon", {"Accept-Encoding": "gzip, br"}),
+)
+
+
+class _CannedResponse(requests.Response):
+    def __init__(self) -> None:
+        super().__init__()
+        self.status_code = 200
+        self._content = json.dumps(_PAYLOAD).encode("utf-8")
+
+
+class _CannedSession(requests.Session):
+    def get(self, url, **kwargs):  # type: ignore[override]
+        return _CannedResponse()
+
+
+@web_app.app.route("/__bench/legacy")
+def _legacy_weather_api():
+    """Previous behaviour: serialize every field with jsonify on every request."""
+    settings = web_app.get_settings()
+    report = web_app._client_for(settings.keys()).get_weather(web_app.request.args["location"])
+    return web_app.jsonify({"data": serialize_report(report)})
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario.")
+    args = parser.parse_args(argv)
+
+    settings = web_app.get_settings()
+    canned = OpenWeatherClient(
+        settings=Settings(api_key=settings.api_key), session=_CannedSession()
+    )
+    web_app._client_for = lambda keys: canned
+    client = web_app.app.test_client()
+
+    print(f"{'scenario':<32}{'bytes':>8}{'encoding':>10}{'cpu us/req':>12}")
+    for label, query, headers in _SCENARIOS:
+        if headers.get("Accept-Encoding") == "br" and "br" not in ENCODERS:
+            print(f"{label:<32}{'skipped (brotli not installed)':>30}")
+            continue
+
+        if query is None:
+            url = "/__bench/legacy?location=London"
+        else:
+            url = f"/api/weather?location=London{query}"
+        response = client.get(url, headers=headers)
+
+        started = time.process_time()
+        for _ in range(args.requests):
+            client.get(url, headers=headers)
+        elapsed = time.process_time() - started
+
+        encoding = response.headers.get("Content-Encoding", "identity")
+        per_request = elapsed / args.requests * 1e6
+        print(f"{label:<32}{len(response.data):>8}{encoding:>10}{per_request:>12.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
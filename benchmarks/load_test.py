@@ -0,0 +1,231 @@
+"""Load test comparing the threaded Flask server with the ASGI serving mode.
+
+Starts a fake OpenWeatherMap upstream with a fixed response delay, launches
+each server in a subprocess pointed at it, and drives ``/api/weather`` with a
+fixed number of concurrent clients. Every request uses a distinct location
+so the client cache never short-circuits the upstream round trip.
+
+    python benchmarks/load_test.py --concurrency 500 --duration 10 --latency 0.3
+
+Resident memory is read from /proc and therefore only reported on Linux.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiohttp
+
+_ROOT = Path(__file__).resolve().parents[1]
+
+_SERVERS = {
+    "flask (threaded)": [
+        sys.executable,
+        "-c",
+        "import sys, web_app; from werkzeug.serving import run_simple; "
+        "run_simple('127.0.0.1', int(sys.argv[1]), web_app.app, threaded=True)",
+        "{port}",
+    ],
+    "asgi (uvicorn)": [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "asgi_app:app",
+        "--port",
+        "{port}",
+        "--log-level",
+        "warning",
+        "--backlog",
+        "4096",
+    ],
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _fake_upstream(latency: float) -> asyncio.AbstractServer:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+
+                target = request_line.split(b" ")[1].decode()
+                query = dict(
+                    part.split("=", 1) for part in target.partition("?")[2].split("&") if "=" in part
+                )
+                await asyncio.sleep(latency)
+                body = json.dumps(
+                    {
+                        "id": 1,
+                        "name": query.get("q", "Somewhere"),
+                        "dt": int(time.time()),
+                        "sys": {"country": "GB"},
+                        "main": {"temp": 11.3, "feels_like": 10.2, "humidity": 81, "pressure": 1012},
+                        "wind": {"speed": 4.6},
+                        "weather": [{"id": 500, "description": "light rain", "icon": "10d"}],
+                    }
+                ).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except (ConnectionError, IndexError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0, backlog=4096)
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+async def _wait_until_ready(url: str, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(url) as response:
+                    await response.read()
+                return
+            except aiohttp.ClientError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start in time.")
+
+
+async def _drive(base_url: str, concurrency: int, duration: float, pid: int) -> Dict[str, object]:
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+    peak_rss = _rss_mb(pid) or 0.0
+    deadline = time.monotonic() + duration
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=30)
+
+    async with aiohttp.ClientSession(base_url, connector=connector, timeout=timeout) as session:
+
+        async def worker() -> None:
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    async with session.get(
+                        "/api/weather", params={"location": f"City {next(counter)}"}
+                    ) as response:
+                        await response.read()
+                        ok = response.status == 200
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        async def sample_memory() -> None:
+            nonlocal peak_rss
+            while time.monotonic() < deadline:
+                peak_rss = max(peak_rss, _rss_mb(pid) or 0.0)
+                await asyncio.sleep(0.25)
+
+        started = time.monotonic()
+        await asyncio.gather(sample_memory(), *(worker() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else float("nan"),
+        "peak_rss_mb": peak_rss or float("nan"),
+    }
+
+
+async def _run(args: argparse.Namespace) -> None:
+    upstream = await _fake_upstream(args.latency)
+    upstream_port = upstream.sockets[0].getsockname()[1]
+    env = dict(
+        os.environ,
+        OPENWEATHER_API_KEY="load-test",
+        OPENWEATHER_API_ROOT=f"http://127.0.0.1:{upstream_port}/data/2.5",
+    )
+
+    print(
+        f"concurrency={args.concurrency} duration={args.duration}s "
+        f"upstream latency={args.latency * 1000:.0f}ms"
+    )
+    print(f"{'server':<20}{'req/s':>10}{'ok':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'peak RSS MB':>13}")
+
+    for name, command in _SERVERS.items():
+        if args.only and args.only not in name:
+            continue
+        port = _free_port()
+        process = subprocess.Popen(
+            [part.format(port=port) for part in command],
+            cwd=_ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            await _wait_until_ready(base_url + "/static/css/styles.css")
+            result = await _drive(base_url, args.concurrency, args.duration, process.pid)
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+        print(
+            f"{name:<20}{result['rps']:>10.1f}{result['requests']:>8}{result['errors']:>8}"
+            f"{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}{result['peak_rss_mb']:>13.1f}"
+        )
+
+    upstream.close()
+    await upstream.wait_closed()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=200, help="Concurrent clients.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per server.")
+    parser.add_argument(
+        "--latency", type=float, default=0.2, help="Fake upstream response delay in seconds."
+    )
+    parser.add_argument("--only", help="Run only servers whose name contains this text.")
+    args = parser.parse_args(argv)
+
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
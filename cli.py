@@ -3,12 +3,34 @@
 from __future__ import annotations
 
 import argparse
+import math
+import shutil
 import sys
+import time
 from datetime import datetime
+from pathlib import Path
+from typing import Optional, TextIO
 
+from weather_app.alerts import Alert, AlertConfig, AlertEngine, load_rules
 from weather_app.api import OpenWeatherClient
 from weather_app.config import get_settings
 from weather_app.exceptions import ConfigurationError, WeatherAppError
+from weather_app.freshness import FreshnessScheduler, LocationState
+from weather_app.models import WeatherReport
+from weather_app.profiling import Profiler, phase
+from weather_app.units import CANONICAL_UNITS
+
+_DEFAULT_PROFILE_PATH = Path("weather-profile.folded")
+
+
+def _positive_float(value: str) -> float:
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: '{value}'") from None
+    if not (math.isfinite(number) and number > 0):
+        raise argparse.ArgumentTypeError(f"must be a positive number of seconds, got '{value}'")
+    return number
 
 
 def parse_args(argv: list[str]) -> argparse.Namespace:
@@ -16,8 +38,10 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         description="Get current weather data using the OpenWeatherMap API.",
     )
     parser.add_argument(
-        "location",
-        help="City name or city,country code (e.g. London or London,UK)",
+        "locations",
+        nargs="+",
+        metavar="location",
+        help="City name or city,country code (e.g. London or London,UK). Repeat for several cities.",
     )
     parser.add_argument(
         "--units",
@@ -28,41 +52,241 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         "--language",
         help="Language code for weather description (default taken from configuration).",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the lookup: print phase timings to stderr and write collapsed stacks.",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=Path,
+        default=_DEFAULT_PROFILE_PATH,
+        metavar="PATH",
+        help=f"Collapsed-stack (flamegraph) output file for --profile (default: {_DEFAULT_PROFILE_PATH}).",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep the locations on screen and refetch each one when a new observation is due.",
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=_positive_float,
+        default=60.0,
+        metavar="SECONDS",
+        help="Shortest time between two fetches of the same location in --watch mode (default: 60).",
+    )
+    parser.add_argument(
+        "--alert",
+        action="append",
+        default=[],
+        metavar="RULE",
+        help="Flag locations where a condition starts holding, e.g. 'freezing: temperature < 0'. "
+        "Thresholds are metric. Repeatable.",
+    )
+    parser.add_argument(
+        "--alert-file",
+        type=Path,
+        metavar="PATH",
+        help="JSON file with alert rules, used in addition to --alert.",
+    )
     return parser.parse_args(argv)
 
 
 def main(argv: list[str] | None = None) -> int:
     args = parse_args(argv or sys.argv[1:])
 
+    if not args.profile:
+        return _run(args)
+
+    with Profiler() as profiler:
+        exit_code = _run(args)
+    path = profiler.write_collapsed(args.profile_output)
+    print(profiler.format_summary(), file=sys.stderr)
+    print(f"[profile] collapsed stacks written to {path}", file=sys.stderr)
+    return exit_code
+
+
+def _run(args: argparse.Namespace) -> int:
     try:
-        settings = get_settings(
-            units=args.units if args.units else None,
-            language=args.language if args.language else None,
-        )
+        with phase("settings"):
+            settings = get_settings(
+                units=args.units if args.units else None,
+                language=args.language if args.language else None,
+            )
     except ConfigurationError as exc:
         print(f"[config] {exc}", file=sys.stderr)
         return 2
 
+    try:
+        alerts = _alert_engine(args)
+    except ValueError as exc:
+        print(f"[input] {exc}", file=sys.stderr)
+        return 2
+
     client = OpenWeatherClient(settings=settings)
+    units = args.units or settings.units
+
+    if args.watch:
+        return _watch(client, args, units=units, alerts=alerts)
+
+    observed: dict[str, WeatherReport] = {}
 
+    exit_code = 0
+    for index, location in enumerate(args.locations):
+        try:
+            report = client.get_weather(
+                location,
+                units=args.units,
+                language=args.language,
+            )
+        except WeatherAppError as exc:
+            print(f"[error] {exc}", file=sys.stderr)
+            exit_code = 1
+            continue
+        except ValueError as exc:
+            print(f"[input] {exc}", file=sys.stderr)
+            exit_code = 1
+            continue
+
+        if index:
+            print()
+        with phase("render"):
+            _print_report(report, units=units)
+        if alerts is not None:
+            observed[location] = _canonical_report(client, location, args)
+
+    if alerts is not None:
+        for alert in alerts.evaluate(observed):
+            print(f"[alert] {alert.message()}", file=sys.stderr)
+    return exit_code
+
+
+def _alert_engine(args: argparse.Namespace) -> Optional[AlertEngine]:
+    rules = load_rules(args.alert)
+    if args.alert_file is not None:
+        # Re-check the combined list so names stay unique across both sources.
+        rules = load_rules([*rules, *AlertConfig.load(args.alert_file).rules])
+    return AlertEngine(rules) if rules else None
+
+
+def _canonical_report(
+    client: OpenWeatherClient, location: str, args: argparse.Namespace
+) -> WeatherReport:
+    """Metric report for alert thresholds; served from the client cache after a lookup."""
+    return client.get_weather(location, units=CANONICAL_UNITS, language=args.language)
+
+
+def _watch(
+    client: OpenWeatherClient,
+    args: argparse.Namespace,
+    *,
+    units: str,
+    alerts: Optional[AlertEngine] = None,
+) -> int:
+    """Refresh several locations, fetching each only when new data is expected."""
     try:
-        report = client.get_weather(
-            args.location,
-            units=args.units,
-            language=args.language,
-        )
-    except WeatherAppError as exc:
-        print(f"[error] {exc}", file=sys.stderr)
-        return 1
+        scheduler = FreshnessScheduler(args.locations, min_interval=args.min_interval)
     except ValueError as exc:
         print(f"[input] {exc}", file=sys.stderr)
         return 1
 
-    _print_report(report, units=args.units or settings.units)
-    return 0
+    display = _WatchDisplay(scheduler.states, units=units, stream=sys.stdout)
+    try:
+        while True:
+            for state in scheduler.due():
+                try:
+                    report = client.get_weather(
+                        state.query,
+                        units=args.units,
+                        language=args.language,
+                        use_cache=False,
+                    )
+                except (WeatherAppError, ValueError) as exc:
+                    changed = scheduler.record_error(state.query, str(exc))
+                    display.update(state, changed=changed)
+                    continue
+
+                changed = scheduler.record_report(state.query, report)
+                display.update(state, changed=changed)
+                if changed and alerts is not None:
+                    canonical = _canonical_report(client, state.query, args)
+                    for alert in alerts.evaluate({state.query: canonical}):
+                        display.notify(alert)
+            time.sleep(max(1.0, scheduler.seconds_until_next()))
+    except KeyboardInterrupt:
+        return 0
+
+
+class _WatchDisplay:
+    """Table of watched locations; only rows whose data changed are redrawn.
 
+    Rows are redrawn in place by moving the cursor a number of lines, so on a
+    terminal every line is clipped to its width: a wrapped row would throw
+    the count off.
+    """
 
-def _print_report(report, *, units: str) -> None:
+    def __init__(self, states: list[LocationState], *, units: str, stream: TextIO) -> None:
+        self._rows = {state.query: index for index, state in enumerate(states)}
+        self._units = units
+        self._stream = stream
+        self._in_place = stream.isatty()
+        self._trailing = 0  # alert lines printed below the table
+
+        header = f"{'Location':<20}{'Temp':>9}{'Feels':>9}{'Hum':>5}{'Wind':>10}  {'Obs':<5}  Conditions"
+        self._write(self._clip(header) + "\n" + self._clip("-" * len(header)) + "\n")
+        for state in states:
+            self._write(self._clip(self._format(state)) + "\n")
+
+    def update(self, state: LocationState, *, changed: bool) -> None:
+        if not changed:
+            return
+        line = self._format(state)
+        if not self._in_place:
+            self._write(f"{datetime.now():%H:%M:%S} {line}\n")
+            return
+
+        # Move up to the row, rewrite it, then return the cursor below the table.
+        offset = len(self._rows) - self._rows[state.query] + self._trailing
+        self._write(f"\x1b[{offset}F\x1b[2K{self._clip(line)}\x1b[{offset}E")
+
+    def notify(self, alert: Alert) -> None:
+        self._write(self._clip(f"{datetime.now():%H:%M:%S} [alert] {alert.message()}") + "\n")
+        if self._in_place:
+            self._trailing += 1
+
+    def _format(self, state: LocationState) -> str:
+        if state.error:
+            return f"{state.query[:19]:<20}[error] {state.error}"
+        report = state.report
+        if report is None:
+            return f"{state.query[:19]:<20}waiting for data..."
+
+        temp_suffix, wind_suffix = _unit_suffixes(self._units)
+        observed = report.timestamp.astimezone()
+        return (
+            f"{report.display_name()[:19]:<20}"
+            f"{report.temperature:>7.1f}{temp_suffix:<2}"
+            f"{report.feels_like:>7.1f}{temp_suffix:<2}"
+            f"{report.humidity:>4}%"
+            f"{report.wind_speed:>6.1f} {wind_suffix:<3}"
+            f"  {observed:%H:%M}"
+            f"  {report.description}"
+        )
+
+    def _clip(self, line: str) -> str:
+        if not self._in_place:
+            return line
+        # One column short of the edge: some terminals wrap as soon as it is filled.
+        width = shutil.get_terminal_size().columns - 1
+        return line if len(line) <= width else line[: max(width - 1, 0)] + "…"
+
+    def _write(self, text: str) -> None:
+        self._stream.write(text)
+        self._stream.flush()
+
+
+def _unit_suffixes(units: str) -> tuple[str, str]:
     unit_suffix = {
         "standard": "K",
         "metric": "°C",
@@ -73,6 +297,11 @@ def _print_report(report, *, units: str) -> None:
         "metric": "m/s",
         "imperial": "mph",
     }[units]
+    return unit_suffix, wind_suffix
+
+
+def _print_report(report: WeatherReport, *, units: str) -> None:
+    unit_suffix, wind_suffix = _unit_suffixes(units)
 
     local_time = report.timestamp.astimezone()
 
@@ -130,7 +130,7 @@ function updateResultCard(data, units) {
     resultWind.textContent = describeWind(units, data.wind_speed);
 
     if (data.icon) {
-        resultIcon.src = `https://openweathermap.org/img/wn/${data.icon}@2x.png`;
+        resultIcon.src = `/icons/${data.icon}`;
         resultIcon.hidden = false;
     } else {
         resultIcon.hidden = true;
@@ -2,16 +2,29 @@
 
 from __future__ import annotations
 
-import threading
+import io
+import time
 import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from tkinter import messagebox, ttk
-from typing import Optional
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageTk
 
 from weather_app.api import OpenWeatherClient
 from weather_app.config import Settings, get_settings
 from weather_app.exceptions import ConfigurationError, WeatherAppError
+from weather_app.icons import IconStore
 from weather_app.models import WeatherReport
 
+_WORKER_COUNT = 2
+_DEBOUNCE_MS = 600
+_RESULT_CACHE_SIZE = 32
+_RESULT_CACHE_TTL = 300  # seconds
+
+_CacheKey = Tuple[str, str, str]
+
 
 class WeatherAppGUI(tk.Tk):
     """Tkinter main window for the weather application."""
@@ -28,13 +41,26 @@ class WeatherAppGUI(tk.Tk):
             raise
 
         self._client = OpenWeatherClient(settings=self._settings)
+        self._icon_store = IconStore()
+        # PhotoImage objects must be created on the Tk thread and kept alive.
+        self._icon_images: Dict[str, ImageTk.PhotoImage] = {}
 
         self._location_var = tk.StringVar()
         self._units_var = tk.StringVar(value=self._settings.units)
         self._language_var = tk.StringVar(value=self._settings.language)
         self._status_var = tk.StringVar(value="Enter a city and click Fetch.")
 
+        # A small persistent pool replaces the thread-per-click model. Every
+        # request gets a sequence number; only the newest one may render.
+        self._executor = ThreadPoolExecutor(max_workers=_WORKER_COUNT, thread_name_prefix="weather")
+        self._request_seq = 0
+        self._pending: Optional[Future] = None
+        self._debounce_job: Optional[str] = None
+        self._result_cache: "OrderedDict[_CacheKey, Tuple[float, WeatherReport]]" = OrderedDict()
+
         self._build_widgets()
+        self._location_var.trace_add("write", self._on_location_changed)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def _build_widgets(self) -> None:
         padding = {"padx": 10, "pady": 5}
@@ -70,41 +96,162 @@ class WeatherAppGUI(tk.Tk):
         result_frame = ttk.Frame(frm)
         result_frame.grid(row=5, column=0, columnspan=2, sticky="NSEW")
 
+        self._icon_label = ttk.Label(result_frame)
+        self._icon_label.pack(side="left", anchor="n", padx=(0, 5))
+
         self._result_text = tk.Text(result_frame, width=50, height=10, state="disabled")
-        self._result_text.pack(fill="both", expand=True)
+        self._result_text.pack(side="left", fill="both", expand=True)
 
         status_label = ttk.Label(self, textvariable=self._status_var, relief="sunken", anchor="w")
         status_label.grid(row=1, column=0, sticky="EW", padx=5, pady=(0, 5))
 
     def _on_fetch_clicked(self) -> None:
+        self._cancel_debounce()
         location = self._location_var.get().strip()
         if not location:
             messagebox.showwarning("Input Required", "Please enter a location.")
             return
 
+        self._request_weather(location, self._units_var.get(), self._language_var.get())
+
+    def _on_location_changed(self, *_: object) -> None:
+        """Debounce typing: fetch once the input has been idle for a moment."""
+        self._cancel_debounce()
+        if self._location_var.get().strip():
+            self._debounce_job = self.after(_DEBOUNCE_MS, self._on_debounce_elapsed)
+
+    def _on_debounce_elapsed(self) -> None:
+        self._debounce_job = None
+        location = self._location_var.get().strip()
+        if location:
+            self._request_weather(
+                location, self._units_var.get(), self._language_var.get(), interactive=False
+            )
+
+    def _cancel_debounce(self) -> None:
+        if self._debounce_job is not None:
+            self.after_cancel(self._debounce_job)
+            self._debounce_job = None
+
+    def _request_weather(
+        self, location: str, units: str, language: str, *, interactive: bool = True
+    ) -> None:
+        self._request_seq += 1
+        seq = self._request_seq
+
+        # Abandon the superseded request. A future that has not started yet is
+        # dropped outright; one already running finishes but is never rendered.
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+
+        key = (location.lower(), units, language.lower())
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            self._set_loading_state(False)
+            self._display_report(cached, units)
+            self._status_var.set("Weather data loaded from recent results.")
+            return
+
         self._set_loading_state(True)
-        thread = threading.Thread(
-            target=self._fetch_weather_thread,
-            args=(location, self._units_var.get(), self._language_var.get()),
-            daemon=True,
+        self._pending = self._executor.submit(
+            self._fetch_weather, seq, key, location, units, language, interactive
         )
-        thread.start()
 
-    def _fetch_weather_thread(self, location: str, units: str, language: str) -> None:
+    def _fetch_weather(
+        self,
+        seq: int,
+        key: _CacheKey,
+        location: str,
+        units: str,
+        language: str,
+        interactive: bool,
+    ) -> None:
         try:
             report = self._client.get_weather(location, units=units, language=language)
         except WeatherAppError as exc:
-            self.after(0, lambda: self._handle_error(str(exc)))
+            message = str(exc)
+            self._post_result(seq, lambda: self._handle_error(message, interactive=interactive))
         except ValueError as exc:
-            self.after(0, lambda: self._handle_error(str(exc)))
+            message = str(exc)
+            self._post_result(seq, lambda: self._handle_error(message, interactive=interactive))
         else:
-            self.after(0, lambda: self._display_report(report, units))
-        finally:
-            self.after(0, lambda: self._set_loading_state(False))
+            icon_data = self._load_icon_data(report.icon)
+            self._post_result(
+                seq,
+                lambda: self._display_report(report, units),
+                cache_entry=(key, report),
+                icon=(report.icon, icon_data),
+            )
+
+    def _load_icon_data(self, code: Optional[str]) -> Optional[bytes]:
+        """Read icon bytes on the worker thread; a missing icon never fails the lookup."""
+        if not code or code in self._icon_images:
+            return None
+        try:
+            return self._icon_store.get(code)
+        except (WeatherAppError, ValueError):
+            return None
+
+    def _post_result(
+        self,
+        seq: int,
+        callback,
+        *,
+        cache_entry: Optional[Tuple[_CacheKey, WeatherReport]] = None,
+        icon: Optional[Tuple[Optional[str], Optional[bytes]]] = None,
+    ) -> None:
+        """Marshal a worker result onto the Tk thread, dropping stale ones."""
+
+        def _apply() -> None:
+            # Superseded results are still worth caching, just not rendering.
+            if cache_entry is not None:
+                self._cache_store(*cache_entry)
+            if icon is not None:
+                self._cache_icon(*icon)
+            if seq != self._request_seq:
+                return
+            self._pending = None
+            self._set_loading_state(False)
+            callback()
 
-    def _handle_error(self, message: str) -> None:
+        try:
+            self.after(0, _apply)
+        except RuntimeError:
+            # The window was destroyed while the request was in flight.
+            pass
+
+    def _cache_lookup(self, key: _CacheKey) -> Optional[WeatherReport]:
+        entry = self._result_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, report = entry
+        if time.monotonic() - stored_at > _RESULT_CACHE_TTL:
+            del self._result_cache[key]
+            return None
+        self._result_cache.move_to_end(key)
+        return report
+
+    def _cache_store(self, key: _CacheKey, report: WeatherReport) -> None:
+        self._result_cache[key] = (time.monotonic(), report)
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > _RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+
+    def _cache_icon(self, code: Optional[str], data: Optional[bytes]) -> None:
+        if code and data and code not in self._icon_images:
+            with Image.open(io.BytesIO(data)) as image:
+                self._icon_images[code] = ImageTk.PhotoImage(image.convert("RGBA"))
+
+    def _on_close(self) -> None:
+        self._cancel_debounce()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
+
+    def _handle_error(self, message: str, *, interactive: bool = True) -> None:
         self._status_var.set(f"Error: {message}")
-        messagebox.showerror("Weather Error", message)
+        if interactive:
+            messagebox.showerror("Weather Error", message)
 
     def _display_report(self, report: WeatherReport, units: str) -> None:
         unit_suffix = {
@@ -131,6 +278,8 @@ class WeatherAppGUI(tk.Tk):
             f"Wind Speed: {report.wind_speed:.1f} {wind_suffix}",
         ]
 
+        self._icon_label.configure(image=self._icon_images.get(report.icon or "", ""))
+
         self._result_text.configure(state="normal")
         self._result_text.delete("1.0", tk.END)
         self._result_text.insert(tk.END, "\n".join(lines))
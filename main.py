@@ -17,6 +17,11 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         default="cli",
         help="Launch mode: command-line interface or Tkinter GUI (default: cli).",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile a CLI lookup (forwarded to cli.py --profile).",
+    )
     parser.add_argument(
         "rest",
         nargs=argparse.REMAINDER,
@@ -29,10 +34,14 @@ def main(argv: list[str] | None = None) -> int:
     args = parse_args(argv or sys.argv[1:])
 
     if args.mode == "gui":
+        if args.profile:
+            print("[profile] Profiling is only available in cli mode.", file=sys.stderr)
+            return 2
         gui.main()
         return 0
 
-    return cli.main(args.rest)
+    rest = ["--profile", *args.rest] if args.profile else args.rest
+    return cli.main(rest)
 
 
 if __name__ == "__main__":
@@ -2,12 +2,24 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import streamlit as st
 from streamlit import session_state
 
 from weather_app.api import OpenWeatherClient
-from weather_app.config import Settings, get_settings
+from weather_app.config import ApiKey, Settings, get_settings
 from weather_app.exceptions import ConfigurationError, NetworkError, WeatherAppError, WeatherServiceError
+from weather_app.models import WeatherReport
+
+_MAX_COMPARE_CITIES = 20
+_COMPARE_COLUMNS = 4
+# (temperature, wind speed) unit symbols per units system.
+_UNIT_SYMBOLS = {
+    "metric": ("°C", "m/s"),
+    "imperial": ("°F", "mph"),
+    "standard": ("K", "m/s"),
+}
 
 
 # Page configuration
@@ -106,12 +118,18 @@ st.markdown(
 )
 
 
+@st.cache_resource
+def get_shared_client(keys: tuple[ApiKey, ...]) -> OpenWeatherClient:
+    """One client per key set for all sessions, so its cache and connection pool are shared."""
+    return OpenWeatherClient(settings=Settings(api_key=keys[0].value, api_keys=keys))
+
+
 def initialize_session_state() -> None:
     """Initialize session state variables."""
     if "weather_client" not in session_state:
         try:
             settings = get_settings()
-            session_state.weather_client = OpenWeatherClient(settings=settings)
+            session_state.weather_client = get_shared_client(settings.keys())
             session_state.settings = settings
         except ConfigurationError as exc:
             st.error(f"Configuration Error: {exc}")
@@ -154,12 +172,7 @@ def get_weather_emoji(icon_code: str | None) -> str:
 
 def format_temperature(temp: float, units: str) -> tuple[str, str]:
     """Format temperature with appropriate unit symbol."""
-    unit_map = {
-        "metric": ("°C", "m/s"),
-        "imperial": ("°F", "mph"),
-        "standard": ("K", "m/s"),
-    }
-    temp_unit, wind_unit = unit_map.get(units, ("°C", "m/s"))
+    temp_unit, wind_unit = _UNIT_SYMBOLS.get(units, _UNIT_SYMBOLS["metric"])
     return f"{temp:.1f}{temp_unit}", wind_unit
 
 
@@ -242,6 +255,92 @@ def display_weather_result(report, units: str) -> None:
     st.info(f"📅 Last updated: {local_time.strftime('%Y-%m-%d %H:%M:%S %Z')}")
 
 
+def parse_compare_cities(text: str) -> list[str]:
+    """One city per line, duplicates (ignoring case) removed, input order kept."""
+    cities: list[str] = []
+    seen: set[str] = set()
+    for line in text.splitlines():
+        city = line.strip()
+        if city and city.casefold() not in seen:
+            seen.add(city.casefold())
+            cities.append(city)
+    return cities
+
+
+def display_compact_result(report: WeatherReport, units: str) -> str:
+    """Small HTML card used in the comparison grid."""
+    temp_str, wind_unit = format_temperature(report.temperature, units)
+    return f"""
+        <div class="metric-card">
+            <div style="font-size: 2rem;">{get_weather_emoji(report.icon)}</div>
+            <div><strong>{report.display_name()}</strong></div>
+            <div class="metric-value">{temp_str}</div>
+            <div class="metric-label">{report.description}</div>
+            <div style="color: #666;">💧 {report.humidity}% • 💨 {report.wind_speed:.1f} {wind_unit}</div>
+        </div>
+        """
+
+
+def render_comparison(cities: list[str], units: str, language: str | None) -> None:
+    """Fetch ``cities`` concurrently and fill in each card as its result arrives.
+
+    Lookups run on a thread per city owned by this comparison, so sessions
+    never queue behind each other; only this (script) thread touches
+    Streamlit. Cities already in the search history are normally answered
+    from the shared client's cache without a network round trip.
+    """
+    client: OpenWeatherClient = session_state.weather_client
+    columns = st.columns(min(_COMPARE_COLUMNS, len(cities)))
+    placeholders = {}
+    for index, city in enumerate(cities):
+        with columns[index % len(columns)]:
+            placeholders[city] = st.empty()
+            placeholders[city].markdown(f"⏳ {city}")
+
+    progress = st.progress(0.0, text="🌍 Fetching weather data...")
+    reports: dict[str, WeatherReport] = {}
+    with ThreadPoolExecutor(
+        max_workers=len(cities), thread_name_prefix="weather-compare"
+    ) as executor:
+        futures = {
+            executor.submit(client.get_weather, city, units=units, language=language): city
+            for city in cities
+        }
+        for completed, future in enumerate(as_completed(futures), start=1):
+            city = futures[future]
+            try:
+                report = future.result()
+            except (WeatherAppError, ValueError) as exc:
+                placeholders[city].error(f"{city}: {exc}")
+            else:
+                reports[city] = report
+                placeholders[city].markdown(
+                    display_compact_result(report, units), unsafe_allow_html=True
+                )
+            progress.progress(completed / len(futures), text=f"🌍 {completed}/{len(futures)} cities")
+    progress.empty()
+
+    if reports:
+        temp_unit, wind_unit = _UNIT_SYMBOLS.get(units, _UNIT_SYMBOLS["metric"])
+        st.dataframe(
+            [
+                {
+                    "City": reports[city].display_name(),
+                    f"Temp ({temp_unit})": reports[city].temperature,
+                    f"Feels like ({temp_unit})": reports[city].feels_like,
+                    "Humidity (%)": reports[city].humidity,
+                    "Pressure (hPa)": reports[city].pressure,
+                    f"Wind ({wind_unit})": reports[city].wind_speed,
+                    "Conditions": reports[city].description,
+                }
+                for city in cities
+                if city in reports
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+
 def main() -> None:
     """Main application entry point."""
     initialize_session_state()
@@ -323,6 +422,7 @@ def main() -> None:
                             query,
                             units=units,
                             language=language if language else None,
+                            use_cache=not refresh_button,
                         )
                         
                         session_state.last_result = report
@@ -352,6 +452,27 @@ def main() -> None:
         st.divider()
         st.subheader("📊 Current Weather")
         display_weather_result(session_state.last_result, units)
+
+    # Multi-city comparison
+    st.divider()
+    st.header("🆚 Compare Cities")
+    with st.form("weather_compare_form"):
+        compare_text = st.text_area(
+            "Cities to compare (one per line)",
+            value="\n".join(session_state.search_history[-_MAX_COMPARE_CITIES:]),
+            placeholder="London,UK\nParis,FR\nTokyo,JP",
+            help=f"Up to {_MAX_COMPARE_CITIES} cities, fetched in parallel.",
+        )
+        compare_button = st.form_submit_button("📊 Compare", use_container_width=True)
+
+    if compare_button:
+        cities = parse_compare_cities(compare_text)
+        if not cities:
+            st.warning("⚠️ Please enter at least one city to compare.")
+        elif len(cities) > _MAX_COMPARE_CITIES:
+            st.warning(f"⚠️ Please compare at most {_MAX_COMPARE_CITIES} cities at a time.")
+        else:
+            render_comparison(cities, units, language if language else None)
     
     # Footer
     st.divider()
@@ -1,7 +1,15 @@
 """Weather App package initialization."""
 
 from .api import OpenWeatherClient
-from .models import WeatherReport
+from .models import BoundingBox, WeatherReport
+from .providers import OpenWeatherProvider, StaticProvider, WeatherProvider
 
-__all__ = ["OpenWeatherClient", "WeatherReport"]
+__all__ = [
+    "BoundingBox",
+    "OpenWeatherClient",
+    "OpenWeatherProvider",
+    "StaticProvider",
+    "WeatherProvider",
+    "WeatherReport",
+]
 
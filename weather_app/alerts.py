@@ -0,0 +1,298 @@
+"""Threshold alerts evaluated column-wise over many weather reports.
+
+Rules are declarative (``"freezing: temperature < 0"``, ``"gusts: wind_speed
+> 15"``, ``"muggy: humidity rise 20"``) and compiled once. Each pass only
+looks at reports that changed since the previous one, and a rule fires for a
+location when its condition starts holding, at most once per cooldown.
+Thresholds are in canonical (metric) units.
+"""
+
+from __future__ import annotations
+
+import json
+import operator
+import re
+import time
+from dataclasses import dataclass
+from itertools import compress, repeat
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Set, Tuple, Union
+
+from .models import WeatherReport
+
+ALERT_FIELDS = ("temperature", "feels_like", "humidity", "pressure", "wind_speed")
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+# "rise"/"drop" compare the change since the previous report for the location.
+_CHANGES = ("rise", "drop")
+_DEFAULT_COOLDOWN = 3600.0  # seconds between two notifications of one rule for one location
+_DEFAULT_INTERVAL = 300.0  # seconds between background evaluation passes
+_RULE_PATTERN = re.compile(
+    r"^\s*(?:(?P<name>[\w.-]+)\s*:\s*)?(?P<field>\w+)\s*(?P<op><=|>=|==|!=|<|>|rise|drop)\s*"
+    r"(?P<threshold>-?\d+(?:\.\d+)?)\s*$"
+)
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """``field op threshold`` for the locations in ``locations`` (all when empty)."""
+
+    name: str
+    field: str
+    op: str
+    threshold: float
+    locations: FrozenSet[str] = frozenset()
+    cooldown: float = _DEFAULT_COOLDOWN
+
+    def __post_init__(self) -> None:
+        if self.field not in ALERT_FIELDS:
+            raise ValueError(
+                f"Unsupported alert field '{self.field}'. Choose from: {', '.join(ALERT_FIELDS)}."
+            )
+        if self.op not in _COMPARISONS and self.op not in _CHANGES:
+            raise ValueError(
+                f"Unsupported alert operator '{self.op}'. "
+                f"Choose from: {', '.join((*_COMPARISONS, *_CHANGES))}."
+            )
+        if self.cooldown < 0:
+            raise ValueError("Alert cooldown cannot be negative.")
+
+    @classmethod
+    def parse(cls, spec: str) -> "AlertRule":
+        """Parse ``[name:] field op threshold``, e.g. ``"gusts: wind_speed > 15"``."""
+        match = _RULE_PATTERN.match(spec)
+        if match is None:
+            raise ValueError(
+                f"Invalid alert rule '{spec}'. Expected '[name:] field op threshold', "
+                "e.g. 'freezing: temperature < 0' or 'humidity rise 20'."
+            )
+        name = match["name"] or f"{match['field']} {match['op']} {match['threshold']}"
+        return cls(
+            name=name,
+            field=match["field"],
+            op=match["op"],
+            threshold=float(match["threshold"]),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "AlertRule":
+        """Build a rule from a mapping, e.g. one entry of a JSON alerts file."""
+        if "rule" in data:
+            if not isinstance(data["rule"], str):
+                raise ValueError(f"Alert rule {data['rule']!r} must be a string.")
+            base = cls.parse(data["rule"])
+        else:
+            try:
+                field, op = data["field"], data["op"]
+                threshold = _number(data["threshold"], "threshold")
+            except KeyError as exc:
+                raise ValueError(f"Alert rule is missing '{exc.args[0]}'.") from None
+            base = cls(name=f"{field} {op} {threshold:g}", field=field, op=op, threshold=threshold)
+        return cls(
+            name=data.get("name") or base.name,
+            field=base.field,
+            op=base.op,
+            threshold=base.threshold,
+            locations=frozenset(_locations(data.get("locations"))),
+            cooldown=_number(data.get("cooldown", _DEFAULT_COOLDOWN), "cooldown"),
+        )
+
+    def describe(self) -> str:
+        return f"{self.name}: {self.field} {self.op} {self.threshold:g}"
+
+
+@dataclass(frozen=True)
+class Alert:
+    """A rule that started holding for one location."""
+
+    rule: AlertRule
+    location: str
+    report: WeatherReport
+    value: float
+    triggered_at: float
+
+    def message(self) -> str:
+        if self.rule.op in _CHANGES:
+            verb = "rose" if self.rule.op == "rise" else "dropped"
+            detail = f"{self.rule.field} {verb} by {abs(self.value):g}"
+        else:
+            detail = f"{self.rule.field} is {self.value:g} ({self.rule.op} {self.rule.threshold:g})"
+        return f"[{self.rule.name}] {self.report.display_name()}: {detail}"
+
+
+def load_rules(specs: Iterable[Union[str, Mapping[str, Any], AlertRule]]) -> List[AlertRule]:
+    """Parse rule strings and/or mappings, rejecting duplicate names.
+
+    Already built :class:`AlertRule` objects are kept as they are, so rules
+    from several sources can be combined and checked together.
+    """
+    rules = [_rule(spec) for spec in specs]
+    names = [rule.name for rule in rules]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate alert rule name(s): {', '.join(duplicates)}.")
+    return rules
+
+
+def _rule(spec: Union[str, Mapping[str, Any], AlertRule]) -> AlertRule:
+    if isinstance(spec, AlertRule):
+        return spec
+    if isinstance(spec, str):
+        return AlertRule.parse(spec)
+    if isinstance(spec, Mapping):
+        return AlertRule.from_dict(spec)
+    raise ValueError(f"Invalid alert rule {spec!r}: expected a string or an object.")
+
+
+def _number(value: Any, what: str) -> float:
+    # bool is an int, but "threshold": true is certainly a mistake.
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"Alert {what} must be a number, got {value!r}.")
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Alert {what} must be a number, got {value!r}.") from None
+
+
+def _locations(value: Any) -> Tuple[str, ...]:
+    """An optional list of location names; a bare string is rejected, not split."""
+    if not value:
+        return ()
+    if not isinstance(value, (list, tuple)) or not all(isinstance(name, str) for name in value):
+        raise ValueError(f"Alert locations must be a list of names, got {value!r}.")
+    return tuple(value)
+
+
+@dataclass(frozen=True)
+class AlertConfig:
+    """Rules plus the locations and pass interval for a background alert job.
+
+    Loaded from JSON: either a list of rules, or an object with ``rules``
+    and optionally ``locations`` and ``interval`` (seconds).
+    """
+
+    rules: Tuple[AlertRule, ...]
+    locations: Tuple[str, ...] = ()
+    interval: float = _DEFAULT_INTERVAL
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "AlertConfig":
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            raise ValueError(f"Cannot read alert rules from {path}: {exc}") from exc
+        if isinstance(data, list):
+            data = {"rules": data}
+        if not isinstance(data, dict) or not data.get("rules"):
+            raise ValueError(f"{path} must contain a non-empty list of alert rules.")
+
+        interval = _number(data.get("interval", _DEFAULT_INTERVAL), "interval")
+        if interval <= 0:
+            raise ValueError("Alert interval must be positive.")
+        return cls(
+            rules=tuple(load_rules(data["rules"])),
+            locations=_locations(data.get("locations")),
+            interval=interval,
+        )
+
+
+class AlertEngine:
+    """Evaluates compiled rules over the reports that changed since the last pass.
+
+    ``evaluate`` takes the latest report per location key. Unchanged reports
+    are skipped; for the rest every rule is applied to a whole column at
+    once. A (rule, location) pair notifies when its condition turns true and
+    then stays quiet while it holds, and for ``cooldown`` seconds after the
+    previous notification even if the condition flaps.
+    """
+
+    def __init__(
+        self, rules: Iterable[AlertRule], *, clock: Callable[[], float] = time.time
+    ) -> None:
+        self.rules: Tuple[AlertRule, ...] = tuple(rules)
+        self._clock = clock
+        self._fields = tuple(sorted({rule.field for rule in self.rules}))
+        self._needs_previous = any(rule.op in _CHANGES for rule in self.rules)
+        self._compiled = [(rule, self._compile(rule)) for rule in self.rules]
+        self._reports: Dict[str, WeatherReport] = {}
+        # Locations whose condition currently holds, per rule name.
+        self._active: Dict[str, Set[str]] = {rule.name: set() for rule in self.rules}
+        self._last_sent: Dict[Tuple[str, str], float] = {}
+
+    @staticmethod
+    def _compile(rule: AlertRule) -> Callable[[Any, Any], bool]:
+        if rule.op == "rise":
+            return operator.ge
+        if rule.op == "drop":
+            return operator.le
+        return _COMPARISONS[rule.op]
+
+    def evaluate(self, reports: Mapping[str, WeatherReport]) -> List[Alert]:
+        """Return the notifications due for ``reports``; unchanged reports are skipped."""
+        previous_reports = self._reports
+        keys: List[str] = []
+        changed: List[WeatherReport] = []
+        for key, report in reports.items():
+            previous = previous_reports.get(key)
+            if previous is report or previous == report:
+                continue
+            keys.append(key)
+            changed.append(report)
+        if not changed:
+            return []
+
+        columns = {field: [getattr(report, field) for report in changed] for field in self._fields}
+        deltas: Dict[str, List[float]] = {}
+        if self._needs_previous:
+            previous = [previous_reports.get(key) for key in keys]
+            for field in {rule.field for rule in self.rules if rule.op in _CHANGES}:
+                # A location seen for the first time has no change yet.
+                before = [
+                    getattr(report, field) if report is not None else value
+                    for report, value in zip(previous, columns[field])
+                ]
+                deltas[field] = list(map(operator.sub, columns[field], before))
+
+        for key, report in zip(keys, changed):
+            previous_reports[key] = report
+
+        now = self._clock()
+        changed_keys = set(keys)
+        alerts: List[Alert] = []
+        for rule, compare in self._compiled:
+            values = deltas[rule.field] if rule.op in _CHANGES else columns[rule.field]
+            threshold = -rule.threshold if rule.op == "drop" else rule.threshold
+            hits = list(compress(range(len(values)), map(compare, values, repeat(threshold))))
+            if rule.locations:
+                hits = [index for index in hits if keys[index] in rule.locations]
+
+            active = self._active[rule.name]
+            started = [index for index in hits if keys[index] not in active]
+            active.difference_update(changed_keys)
+            active.update(keys[index] for index in hits)
+
+            for index in started:
+                pair = (rule.name, keys[index])
+                last = self._last_sent.get(pair)
+                if last is not None and now - last < rule.cooldown:
+                    continue
+                self._last_sent[pair] = now
+                alerts.append(Alert(rule, keys[index], changed[index], values[index], now))
+        return alerts
+
+    def forget(self, key: str) -> None:
+        """Drop a location that is no longer monitored."""
+        self._reports.pop(key, None)
+        for active in self._active.values():
+            active.discard(key)
+        self._last_sent = {pair: sent for pair, sent in self._last_sent.items() if pair[1] != key}
+
+    def active(self) -> List[Tuple[str, str]]:
+        """(rule name, location) pairs whose condition currently holds."""
+        return sorted((name, key) for name, keys in self._active.items() for key in keys)
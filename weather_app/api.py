@@ -2,32 +2,260 @@
 
 from __future__ import annotations
 
-import logging
-from typing import Any, Dict, Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import requests
-from requests import Response
 
+from .cache import TTLCache
 from .config import Settings, get_settings
-from .exceptions import NetworkError, WeatherServiceError
-from .models import WeatherReport
+from .exceptions import WeatherServiceError
+from .keys import ApiKeyPool
+from .models import BoundingBox, WeatherReport
+from .providers import (
+    _BOX_URL,
+    QUERY_ERROR_STATUSES,
+    Observation,
+    OpenWeatherProvider,
+    ProviderPool,
+    WeatherProvider,
+    create_session,
+    fetch_json,
+)
+from .units import CANONICAL_UNITS, convert_report, convert_reports
 
-_logger = logging.getLogger(__name__)
-_BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
-_DEFAULT_TIMEOUT = 10  # seconds
+_CACHE_TTL = 600  # seconds; OpenWeatherMap refreshes observations roughly every 10 minutes
+_CACHE_SIZE = 4096
+_NEGATIVE_CACHE_TTL = 120  # seconds; short, so newly valid queries recover quickly
+_NEGATIVE_CACHE_SIZE = 8192
+_MAX_QUERY_LENGTH = 100
+_MAX_QUERY_PARTS = 3  # city, state, country
+_QUERY_PUNCTUATION = frozenset(" ,.'-()’")
+_REGION_TILE_SPAN = 10.0  # degrees; larger boxes are split before querying
+_REGION_WORKERS = 4
+_REGION_MAX_TILES = 64  # upstream calls one region request may fan out to
 
 
-class OpenWeatherClient:
-    """Typed interface to the OpenWeatherMap current weather endpoint."""
+@dataclass
+class _Lookup:
+    """A resolved single-location request; ``report`` is set on a cache hit."""
+
+    key: str
+    query: str
+    units: str
+    language: str
+    params: Dict[str, Any]
+    report: Optional[WeatherReport] = None
+
+
+def _validate_query(query: str) -> None:
+    """Reject queries that cannot name a place without asking the API."""
+    if not query or not query.strip():
+        raise ValueError("Location query must be a non-empty string.")
+    if len(query) > _MAX_QUERY_LENGTH:
+        raise ValueError(f"Location query must be at most {_MAX_QUERY_LENGTH} characters.")
+    if query.count(",") >= _MAX_QUERY_PARTS:
+        raise ValueError(
+            "Location query should look like 'City', 'City,Country' or 'City,State,Country'."
+        )
+    if not any(char.isalpha() for char in query):
+        raise ValueError("Location query must contain letters.")
+    if any(not (char.isalnum() or char in _QUERY_PUNCTUATION) for char in query):
+        raise ValueError("Location query contains unsupported characters.")
+
+
+def _normalize_query(query: str) -> str:
+    """Canonical cache form of a location query ("  new york , us" -> "new york,us")."""
+    parts = (re.sub(r"\s+", " ", part).strip() for part in query.split(","))
+    return ",".join(parts).casefold()
+
+
+class _OpenWeatherBase:
+    """Caching and normalization shared by the blocking and asyncio clients.
+
+    Observations are always fetched in metric units and cached once per
+    location; other unit systems are derived locally. Descriptions are
+    remembered per (condition code, language), so a language switch only
+    needs an upstream call the first time a condition is seen in it.
+    Subclasses only add the transport.
+    """
 
     def __init__(
         self,
         *,
         settings: Optional[Settings] = None,
-        session: Optional[requests.Session] = None,
+        cache: Optional[TTLCache[Observation]] = None,
     ) -> None:
         self._settings = settings or get_settings()
-        self._session = session or requests.Session()
+        self._keys = ApiKeyPool(self._settings.keys())
+        self._cache: TTLCache[Observation] = cache or TTLCache(
+            maxsize=_CACHE_SIZE, ttl=_CACHE_TTL
+        )
+        self._descriptions: Dict[Tuple[int, str], str] = {}
+        self._failures: TTLCache[WeatherServiceError] = TTLCache(
+            maxsize=_NEGATIVE_CACHE_SIZE, ttl=_NEGATIVE_CACHE_TTL
+        )
+
+    def _prepare_weather(
+        self,
+        query: str,
+        units: Optional[str],
+        language: Optional[str],
+        use_cache: bool,
+    ) -> _Lookup:
+        _validate_query(query)
+
+        resolved_units = units or self._settings.units
+        resolved_language = (language or self._settings.language).lower()
+        lookup = _Lookup(
+            key=_normalize_query(query),
+            query=query.strip(),
+            units=resolved_units,
+            language=resolved_language,
+            params={
+                "q": query.strip(),
+                "units": CANONICAL_UNITS,
+                "lang": resolved_language,
+            },
+        )
+
+        if use_cache:
+            cached = self._cache.get(lookup.key)
+            if cached is not None:
+                localized = self._localize(cached, resolved_language)
+                if localized is not None:
+                    lookup.report = convert_report(localized, resolved_units)
+                    return lookup
+
+            failure = self._failures.get(lookup.key)
+            if failure is not None:
+                raise type(failure)(str(failure), status_code=failure.status_code)
+        return lookup
+
+    def key_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Usage, failures and cooldown for each configured API key (masked)."""
+        return self._keys.stats()
+
+    def _remember_failure(self, lookup: _Lookup, error: WeatherServiceError) -> None:
+        """Cache failures caused by the query itself so repeats skip the network.
+
+        Auth (401/403), rate limiting (429) and server errors (5xx) are
+        transient and never cached.
+        """
+        if error.status_code in QUERY_ERROR_STATUSES:
+            self._failures.set(lookup.key, error)
+
+    def _complete_weather(self, lookup: _Lookup, observation: Observation) -> WeatherReport:
+        self._remember(lookup.key, observation)
+        # Also answer the resolved "City, CC" form, which is what UIs show and re-query.
+        if observation.report.country:
+            self._cache.set(_normalize_query(observation.report.display_name()), observation)
+        return convert_report(observation.report, lookup.units)
+
+    def _prepare_region(
+        self,
+        bbox: BoundingBox,
+        zoom: int,
+        units: Optional[str],
+        language: Optional[str],
+        tile_span: Optional[float],
+    ) -> Tuple[str, str, List[Dict[str, Any]]]:
+        """Resolve units/language and build the query parameters for every tile."""
+        if zoom < 1:
+            raise ValueError("Zoom level must be a positive integer.")
+
+        resolved_units = units or self._settings.units
+        resolved_language = (language or self._settings.language).lower()
+        tiles = bbox.tiles(tile_span, _REGION_MAX_TILES) if tile_span else [bbox]
+        params = [
+            {
+                "bbox": tile.to_param(zoom),
+                "units": CANONICAL_UNITS,
+                "lang": resolved_language,
+            }
+            for tile in tiles
+        ]
+        return resolved_units, resolved_language, params
+
+    def _complete_region(
+        self, batches: List[List[Dict[str, Any]]], units: str, language: str
+    ) -> List[WeatherReport]:
+        reports: List[WeatherReport] = []
+        seen_ids = set()
+        for entries in batches:
+            for entry in entries:
+                # Tiles share edges, so a station on a border can appear twice.
+                station_id = entry.get("id")
+                if station_id is not None:
+                    if station_id in seen_ids:
+                        continue
+                    seen_ids.add(station_id)
+
+                observation = Observation.from_payload(entry, language)
+                # Only the "City, CC" form is warmed: a bare name such as
+                # "London" may resolve to a different city on its own.
+                key = observation.report.display_name() if observation.report.country else ""
+                self._remember(_normalize_query(key), observation)
+                reports.append(observation.report)
+
+        return convert_reports(reports, units)
+
+    def _remember(self, key: str, observation: Observation) -> None:
+        """Cache a canonical observation and learn its localized description."""
+        if observation.condition_id is not None:
+            self._descriptions[(observation.condition_id, observation.language)] = (
+                observation.report.description
+            )
+        if key:
+            self._cache.set(key, observation)
+
+    def _localize(self, observation: Observation, language: str) -> Optional[WeatherReport]:
+        """Return the cached report in ``language`` or ``None`` if the wording is unknown."""
+        if language == observation.language:
+            return observation.report
+        if observation.condition_id is None:
+            return None
+        description = self._descriptions.get((observation.condition_id, language))
+        if description is None:
+            return None
+        if description == observation.report.description:
+            return observation.report
+        return replace(observation.report, description=description)
+
+
+class OpenWeatherClient(_OpenWeatherBase):
+    """Typed interface to current weather, backed by one or more providers.
+
+    By default every lookup goes to OpenWeatherMap. Pass ``providers`` to put
+    other backends behind the same cache, and ``strategy="race"`` to ask the
+    two fastest healthy ones at once instead of failing over in order.
+    Region lookups always use OpenWeatherMap's box endpoint.
+    """
+
+    def __init__(
+        self,
+        *,
+        settings: Optional[Settings] = None,
+        session: Optional[requests.Session] = None,
+        cache: Optional[TTLCache[Observation]] = None,
+        providers: Optional[Sequence[WeatherProvider]] = None,
+        strategy: str = "failover",
+    ) -> None:
+        super().__init__(settings=settings, cache=cache)
+        self._session = session or create_session()
+        # Region lookups use the client's key pool; providers on the same keys
+        # must count against it too.
+        for provider in providers or ():
+            if isinstance(provider, OpenWeatherProvider):
+                provider.share_keys(self._keys)
+        self._providers = ProviderPool(
+            providers
+            or [OpenWeatherProvider(self._settings, session=self._session, keys=self._keys)],
+            strategy=strategy,
+        )
 
     def get_weather(
         self,
@@ -35,44 +263,62 @@ class OpenWeatherClient:
         *,
         units: Optional[str] = None,
         language: Optional[str] = None,
+        use_cache: bool = True,
     ) -> WeatherReport:
         """Fetch weather for the provided city or geographic query."""
-        if not query or not query.strip():
-            raise ValueError("Location query must be a non-empty string.")
-
-        params = {
-            "q": query.strip(),
-            "appid": self._settings.api_key,
-            "units": units or self._settings.units,
-            "lang": language or self._settings.language,
-        }
+        lookup = self._prepare_weather(query, units, language, use_cache)
+        if lookup.report is not None:
+            return lookup.report
 
         try:
-            response = self._session.get(_BASE_URL, params=params, timeout=_DEFAULT_TIMEOUT)
-        except requests.RequestException as exc:
-            _logger.exception("Network failure while fetching weather data.")
-            raise NetworkError("Unable to reach the OpenWeatherMap service.") from exc
+            observation = self._providers.fetch(lookup.query, lookup.language)
+        except WeatherServiceError as exc:
+            self._remember_failure(lookup, exc)
+            raise
+        return self._complete_weather(lookup, observation)
 
-        payload = self._parse_response(response)
-        return WeatherReport.from_openweather(payload)
+    def provider_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Request counts, smoothed latency and health for each provider."""
+        return self._providers.stats()
 
-    @staticmethod
-    def _parse_response(response: Response) -> Dict[str, Any]:
-        try:
-            response.raise_for_status()
-        except requests.HTTPError as exc:
-            try:
-                payload: Dict[str, Any] = response.json()
-            except ValueError:
-                payload = {}
-
-            message = payload.get("message") or response.reason
-            raise WeatherServiceError(
-                f"OpenWeatherMap request failed [{response.status_code}]: {message}"
-            ) from exc
+    def close(self) -> None:
+        self._providers.close()
+        self._session.close()
 
-        try:
-            return response.json()
-        except ValueError as exc:
-            raise WeatherServiceError("OpenWeatherMap returned invalid JSON.") from exc
+    def get_region_weather(
+        self,
+        bbox: BoundingBox,
+        *,
+        zoom: int = 10,
+        units: Optional[str] = None,
+        language: Optional[str] = None,
+        tile_span: Optional[float] = _REGION_TILE_SPAN,
+        max_workers: int = _REGION_WORKERS,
+    ) -> List[WeatherReport]:
+        """Fetch every station inside ``bbox`` and warm the per-city cache.
+
+        Boxes wider or taller than ``tile_span`` degrees are split into tiles
+        that are fetched concurrently. Pass ``tile_span=None`` to issue a
+        single request regardless of size.
+        """
+        resolved_units, resolved_language, tile_params = self._prepare_region(
+            bbox, zoom, units, language, tile_span
+        )
+
+        def fetch_tile(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+            return self._request(_BOX_URL, params).get("list") or []
+
+        if len(tile_params) == 1:
+            batches = [fetch_tile(tile_params[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(tile_params))) as executor:
+                # Each tile runs in a copy of this context so an active profiler sees it.
+                futures = [
+                    executor.submit(copy_context().run, fetch_tile, params) for params in tile_params
+                ]
+                batches = [future.result() for future in futures]
+
+        return self._complete_region(batches, resolved_units, resolved_language)
 
+    def _request(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        return fetch_json(self._session, url, params, self._keys)
@@ -0,0 +1,132 @@
+"""Asyncio client for the OpenWeatherMap API."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from .api import _REGION_TILE_SPAN, _REGION_WORKERS, _OpenWeatherBase
+from .cache import TTLCache
+from .config import Settings
+from .exceptions import NetworkError, WeatherServiceError
+from .models import BoundingBox, WeatherReport
+from .profiling import phase
+from .providers import _BASE_URL, _BOX_URL, _DEFAULT_TIMEOUT, Observation, _parse_payload
+
+_logger = logging.getLogger(__name__)
+_MAX_CONNECTIONS = 1000
+
+
+class AsyncOpenWeatherClient(_OpenWeatherBase):
+    """Non-blocking counterpart of :class:`~weather_app.api.OpenWeatherClient`.
+
+    Shares the same caching and unit/language handling; upstream calls are
+    awaited on one pooled ``aiohttp.ClientSession`` so a single event loop
+    can keep thousands of lookups in flight.
+    """
+
+    def __init__(
+        self,
+        *,
+        settings: Optional[Settings] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        cache: Optional[TTLCache[Observation]] = None,
+    ) -> None:
+        super().__init__(settings=settings, cache=cache)
+        # Created lazily: aiohttp sessions must be opened inside the running loop.
+        self._session = session
+
+    async def aclose(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=_DEFAULT_TIMEOUT),
+                connector=aiohttp.TCPConnector(
+                    limit=_MAX_CONNECTIONS, limit_per_host=_MAX_CONNECTIONS
+                ),
+            )
+        return self._session
+
+    async def get_weather(
+        self,
+        query: str,
+        *,
+        units: Optional[str] = None,
+        language: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> WeatherReport:
+        """Fetch weather for the provided city or geographic query."""
+        lookup = self._prepare_weather(query, units, language, use_cache)
+        if lookup.report is not None:
+            return lookup.report
+
+        try:
+            payload = await self._request(_BASE_URL, lookup.params)
+        except WeatherServiceError as exc:
+            self._remember_failure(lookup, exc)
+            raise
+        return self._complete_weather(lookup, Observation.from_payload(payload, lookup.language))
+
+    async def get_region_weather(
+        self,
+        bbox: BoundingBox,
+        *,
+        zoom: int = 10,
+        units: Optional[str] = None,
+        language: Optional[str] = None,
+        tile_span: Optional[float] = _REGION_TILE_SPAN,
+        max_concurrency: int = _REGION_WORKERS,
+    ) -> List[WeatherReport]:
+        """Fetch every station inside ``bbox``, at most ``max_concurrency`` tiles at a time."""
+        resolved_units, resolved_language, tile_params = self._prepare_region(
+            bbox, zoom, units, language, tile_span
+        )
+        limit = asyncio.Semaphore(max_concurrency)
+
+        async def fetch_tile(params: Dict[str, Any]) -> Dict[str, Any]:
+            async with limit:
+                return await self._request(_BOX_URL, params)
+
+        payloads = await asyncio.gather(*(fetch_tile(params) for params in tile_params))
+        batches = [payload.get("list") or [] for payload in payloads]
+        return self._complete_region(batches, resolved_units, resolved_language)
+
+    async def _request(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Like :func:`~weather_app.providers.fetch_json`: retry refused keys on another one."""
+        for attempt in range(len(self._keys)):
+            key = self._keys.acquire()
+            try:
+                payload = await self._send(url, {**params, "appid": key})
+            except WeatherServiceError as exc:
+                if self._keys.release(key, exc.status_code) and attempt + 1 < len(self._keys):
+                    continue
+                raise
+            except NetworkError:
+                self._keys.release(key)
+                raise
+            self._keys.release(key, 200)
+            return payload
+        raise AssertionError("unreachable")
+
+    async def _send(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            with phase("upstream.request"):
+                response = await self._get_session().get(url, params=params)
+            try:
+                with phase("upstream.transfer"):
+                    body = await response.read()
+            finally:
+                response.release()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            _logger.exception("Network failure while fetching weather data.")
+            raise NetworkError("Unable to reach the OpenWeatherMap service.") from exc
+
+        return _parse_payload(response.status, response.reason, lambda: json.loads(body))
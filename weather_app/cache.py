@@ -0,0 +1,64 @@
+"""Small in-process caches used by the weather client."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Thread-safe LRU cache whose entries expire after a fixed time-to-live."""
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 1024,
+        ttl: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("Cache size must be positive.")
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the cached value for ``key`` or ``None`` if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: V, *, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entry if full."""
+        expires_at = self._clock() + (self._ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import math
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -29,6 +30,14 @@ def _load_dotenv_files() -> None:
 _load_dotenv_files()
 
 
+@dataclass(frozen=True)
+class ApiKey:
+    """An OpenWeatherMap API key and its share of traffic (proportional to its quota)."""
+
+    value: str
+    weight: float = 1.0
+
+
 @dataclass(frozen=True)
 class Settings:
     """Container for runtime configuration."""
@@ -36,6 +45,11 @@ class Settings:
     api_key: str
     units: str = _DEFAULT_UNITS
     language: str = _DEFAULT_LANGUAGE
+    api_keys: Tuple[ApiKey, ...] = ()
+
+    def keys(self) -> Tuple[ApiKey, ...]:
+        """Every configured key; just ``api_key`` unless a pool was configured."""
+        return self.api_keys or (ApiKey(self.api_key),)
 
 
 def get_settings(
@@ -44,11 +58,13 @@ def get_settings(
     language: Optional[str] = None,
 ) -> Settings:
     """Construct validated settings from environment variables."""
-    api_key = os.getenv("OPENWEATHER_API_KEY")
+    api_keys = _parse_api_keys(os.getenv("OPENWEATHER_API_KEYS", ""))
+    api_key = api_keys[0].value if api_keys else os.getenv("OPENWEATHER_API_KEY")
     if not api_key:
         raise ConfigurationError(
             "Missing OpenWeatherMap API key. "
-            "Set the OPENWEATHER_API_KEY environment variable or define it in a .env file."
+            "Set the OPENWEATHER_API_KEY (or OPENWEATHER_API_KEYS) environment variable "
+            "or define it in a .env file."
         )
 
     resolved_units = _validate_units(units or os.getenv("WEATHER_UNITS", _DEFAULT_UNITS))
@@ -56,7 +72,32 @@ def get_settings(
         language or os.getenv("WEATHER_LANGUAGE", _DEFAULT_LANGUAGE)
     )
 
-    return Settings(api_key=api_key, units=resolved_units, language=resolved_language)
+    return Settings(
+        api_key=api_key, units=resolved_units, language=resolved_language, api_keys=api_keys
+    )
+
+
+def _parse_api_keys(value: str) -> Tuple[ApiKey, ...]:
+    """Parse ``key1:weight,key2,...``; a missing weight means 1."""
+    keys = []
+    for item in value.split(","):
+        key, _, weight = item.strip().partition(":")
+        if not key:
+            continue
+        try:
+            resolved_weight = float(weight) if weight else 1.0
+        except ValueError:
+            resolved_weight = 0.0
+        # "nan" and "inf" parse as floats but would break the least-loaded choice.
+        if not (math.isfinite(resolved_weight) and resolved_weight > 0):
+            raise ConfigurationError(
+                f"Invalid weight '{weight}' in OPENWEATHER_API_KEYS; use a positive number."
+            )
+        keys.append(ApiKey(key, resolved_weight))
+
+    if len({key.value for key in keys}) != len(keys):
+        raise ConfigurationError("OPENWEATHER_API_KEYS lists the same key more than once.")
+    return tuple(keys)
 
 
 def _validate_units(units: str) -> str:
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Optional
+
 
 class WeatherAppError(Exception):
     """Base class for weather app exceptions."""
@@ -14,6 +16,14 @@ class ConfigurationError(WeatherAppError):
 class WeatherServiceError(WeatherAppError):
     """Raised when the weather service returns an unrecoverable error."""
 
+    def __init__(self, message: str, *, status_code: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class LocationNotFoundError(WeatherServiceError):
+    """Raised when the weather service cannot resolve the requested location."""
+
 
 class NetworkError(WeatherAppError):
     """Raised when network communication fails."""
@@ -0,0 +1,113 @@
+"""Schedule refetches around when OpenWeatherMap publishes new observations."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .models import WeatherReport
+
+_DEFAULT_CADENCE = 600.0  # seconds between observations until we have measured one
+_MAX_CADENCE = 3 * 3600.0
+_PUBLISH_DELAY = 60.0  # observations usually appear shortly after their ``dt``
+_MIN_INTERVAL = 60.0  # never poll a single location more often than this
+_CADENCE_SMOOTHING = 0.5
+
+
+@dataclass
+class LocationState:
+    """Freshness bookkeeping for one watched location."""
+
+    query: str
+    report: Optional[WeatherReport] = None
+    error: Optional[str] = None
+    cadence: float = _DEFAULT_CADENCE
+    next_due: float = 0.0
+    stale_polls: int = 0
+    failures: int = 0
+    fetches: int = field(default=0, repr=False)
+
+
+class FreshnessScheduler:
+    """Decide when each location is worth fetching again.
+
+    The next fetch is aimed just after the report's observation time plus
+    the observed update cadence. Polls that return the same observation
+    back off exponentially (capped at the cadence) so a late publication is
+    still picked up without hammering the API.
+    """
+
+    def __init__(
+        self,
+        queries: Iterable[str],
+        *,
+        min_interval: float = _MIN_INTERVAL,
+        publish_delay: float = _PUBLISH_DELAY,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if not min_interval > 0:
+            raise ValueError("Minimum polling interval must be positive.")
+        self._min_interval = min_interval
+        self._publish_delay = publish_delay
+        self._clock = clock
+        self._states: Dict[str, LocationState] = {
+            query: LocationState(query=query) for query in queries
+        }
+        if not self._states:
+            raise ValueError("At least one location is required.")
+
+    @property
+    def states(self) -> List[LocationState]:
+        return list(self._states.values())
+
+    def due(self) -> List[LocationState]:
+        now = self._clock()
+        return [state for state in self._states.values() if state.next_due <= now]
+
+    def seconds_until_next(self) -> float:
+        next_due = min(state.next_due for state in self._states.values())
+        return max(0.0, next_due - self._clock())
+
+    def record_report(self, query: str, report: WeatherReport) -> bool:
+        """Store a fetched report and schedule the next fetch; return True if it changed."""
+        state = self._states[query]
+        now = self._clock()
+        state.fetches += 1
+        state.failures = 0
+        # Clearing a displayed error is a change even if the report is the same.
+        had_error = state.error is not None
+        state.error = None
+
+        previous = state.report
+        changed = had_error or previous is None or report != previous
+        is_new_observation = previous is None or report.timestamp > previous.timestamp
+
+        if previous is not None and is_new_observation:
+            delta = (report.timestamp - previous.timestamp).total_seconds()
+            if 0 < delta <= _MAX_CADENCE:
+                state.cadence += _CADENCE_SMOOTHING * (delta - state.cadence)
+
+        if is_new_observation:
+            state.stale_polls = 0
+            observed = report.timestamp.timestamp()
+            target = observed + state.cadence + self._publish_delay
+            state.next_due = max(target, now + self._min_interval)
+        else:
+            state.stale_polls += 1
+            backoff = self._min_interval * (2 ** (state.stale_polls - 1))
+            state.next_due = now + min(backoff, state.cadence)
+
+        state.report = report
+        return changed
+
+    def record_error(self, query: str, message: str) -> bool:
+        """Note a failed fetch and back off; return True if the displayed error changed."""
+        state = self._states[query]
+        state.fetches += 1
+        state.failures += 1
+        backoff = self._min_interval * (2 ** (state.failures - 1))
+        state.next_due = self._clock() + min(backoff, _MAX_CADENCE)
+        changed = state.error != message
+        state.error = message
+        return changed
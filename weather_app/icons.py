@@ -0,0 +1,131 @@
+"""Local on-disk cache of OpenWeatherMap condition icons."""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import requests
+from PIL import Image
+
+from .exceptions import NetworkError, WeatherServiceError
+
+_logger = logging.getLogger(__name__)
+_ICON_URL = "https://openweathermap.org/img/wn/{code}@2x.png"
+_ICON_SIZE = 100  # pixels; the @2x icons are 100x100
+_DEFAULT_TIMEOUT = 10  # seconds
+_DEFAULT_DIRECTORY = Path.home() / ".weather_app" / "icons"
+
+KNOWN_ICONS: Tuple[str, ...] = tuple(
+    f"{group}{period}"
+    for group in ("01", "02", "03", "04", "09", "10", "11", "13", "50")
+    for period in ("d", "n")
+)
+
+SpriteLayout = Dict[str, Tuple[int, int]]
+
+
+class IconStore:
+    """Fetch each icon at most once and serve it from disk afterwards."""
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        *,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        self._directory = directory or Path(os.getenv("WEATHER_ICON_DIR", _DEFAULT_DIRECTORY))
+        self._session = session or requests.Session()
+        self._memory: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def get(self, code: str) -> bytes:
+        """Return PNG bytes for ``code``, downloading it on first use."""
+        code = self._validate(code)
+        data = self._memory.get(code)
+        if data is not None:
+            return data
+
+        # One lock is plenty: misses happen at most once per icon code.
+        with self._lock:
+            data = self._memory.get(code)
+            if data is None:
+                path = self._directory / f"{code}.png"
+                if path.exists():
+                    data = path.read_bytes()
+                else:
+                    data = self._download(code)
+                    self._write_atomic(path, data)
+                self._memory[code] = data
+        return data
+
+    def seed(self, codes: Iterable[str] = KNOWN_ICONS) -> int:
+        """Make sure every icon in ``codes`` is on disk; return how many were loaded."""
+        count = 0
+        for code in codes:
+            self.get(code)
+            count += 1
+        return count
+
+    def sprite(self, codes: Iterable[str] = KNOWN_ICONS) -> Tuple[bytes, SpriteLayout]:
+        """Pack icons into one horizontal PNG strip and return it with each icon's offset."""
+        codes = tuple(self._validate(code) for code in codes)
+        sheet = Image.new("RGBA", (_ICON_SIZE * len(codes), _ICON_SIZE))
+        layout: SpriteLayout = {}
+        for index, code in enumerate(codes):
+            with Image.open(io.BytesIO(self.get(code))) as icon:
+                icon = icon.convert("RGBA").resize((_ICON_SIZE, _ICON_SIZE))
+                sheet.paste(icon, (index * _ICON_SIZE, 0))
+            layout[code] = (index * _ICON_SIZE, 0)
+
+        buffer = io.BytesIO()
+        sheet.save(buffer, format="PNG", optimize=True)
+        return buffer.getvalue(), layout
+
+    @staticmethod
+    def sprite_css(layout: SpriteLayout, *, url: str) -> str:
+        """CSS classes (``.wx-icon.wx-icon--01d``) positioning each icon inside the sprite."""
+        rules = [
+            f".wx-icon{{display:inline-block;width:{_ICON_SIZE}px;height:{_ICON_SIZE}px;"
+            f"background:url({url}) no-repeat}}"
+        ]
+        rules.extend(
+            f".wx-icon--{code}{{background-position:-{x}px -{y}px}}"
+            for code, (x, y) in layout.items()
+        )
+        return "\n".join(rules) + "\n"
+
+    @staticmethod
+    def _validate(code: str) -> str:
+        # Only the published set: anything else would cost an upstream request that 404s.
+        if code not in KNOWN_ICONS:
+            raise ValueError(f"Unknown weather icon code '{code}'.")
+        return code
+
+    def _download(self, code: str) -> bytes:
+        try:
+            response = self._session.get(_ICON_URL.format(code=code), timeout=_DEFAULT_TIMEOUT)
+        except requests.RequestException as exc:
+            _logger.exception("Network failure while fetching weather icon %s.", code)
+            raise NetworkError("Unable to reach the OpenWeatherMap icon service.") from exc
+
+        if response.status_code != 200 or not response.content:
+            raise WeatherServiceError(
+                f"OpenWeatherMap icon request failed [{response.status_code}] for '{code}'."
+            )
+        return response.content
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(".tmp")
+        temporary.write_bytes(data)
+        temporary.replace(path)
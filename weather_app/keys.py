@@ -0,0 +1,147 @@
+"""Load balancing across several OpenWeatherMap API keys."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Sequence, Tuple
+
+from .config import ApiKey
+
+_USAGE_WINDOW = 60.0  # seconds; OpenWeatherMap quotas are per minute
+_RATE_LIMIT_COOLDOWN = 60.0  # seconds after a 429; doubles while it repeats
+_RATE_LIMIT_COOLDOWN_MAX = 600.0
+_AUTH_COOLDOWN = 900.0  # seconds after a 401/403; the key is likely revoked or blocked
+_RATE_LIMITED = 429
+_REJECTED = frozenset({401, 403})
+_SERVER_ERROR = 500  # and above: counted as a failure, but another key would not help
+
+
+class _KeyState:
+    """Usage counters and cooldown for one key; guarded by the pool's lock."""
+
+    def __init__(self, key: ApiKey) -> None:
+        self.key = key
+        self.requests = 0
+        self.failures = 0
+        self.rate_limited = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.consecutive_rate_limits = 0
+        self.cooldown_until = 0.0
+        self.recent: Deque[float] = deque()
+
+    def used(self, now: float) -> int:
+        """Requests started within the current usage window."""
+        while self.recent and now - self.recent[0] >= _USAGE_WINDOW:
+            self.recent.popleft()
+        return len(self.recent)
+
+
+class ApiKeyPool:
+    """Hands out the least-loaded healthy key relative to its weight.
+
+    Weights are proportional to each key's plan quota, so a key with
+    ``weight=10`` takes ten times the traffic of one with ``weight=1``. A key
+    answered with 429 cools down for a minute (longer if it keeps happening)
+    and one answered with 401/403 for much longer. When every key is cooling
+    down the one that recovers first is used rather than failing locally.
+    """
+
+    def __init__(
+        self, keys: Sequence[ApiKey], *, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        if not keys:
+            raise ValueError("At least one API key is required.")
+        for key in keys:
+            if not (math.isfinite(key.weight) and key.weight > 0):
+                raise ValueError(f"API key weight must be a positive number, got {key.weight!r}.")
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._states = [_KeyState(key) for key in keys]
+        self._by_value = {state.key.value: state for state in self._states}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    @property
+    def keys(self) -> Tuple[ApiKey, ...]:
+        return tuple(state.key for state in self._states)
+
+    def acquire(self) -> str:
+        """Reserve a key for one request; pair every call with :meth:`release`."""
+        with self._lock:
+            now = self._clock()
+            available = [state for state in self._states if state.cooldown_until <= now]
+            if available:
+                state = min(available, key=lambda option: option.used(now) / option.key.weight)
+            else:
+                state = min(self._states, key=lambda candidate: candidate.cooldown_until)
+            state.requests += 1
+            state.in_flight += 1
+            state.recent.append(now)
+            return state.key.value
+
+    def release(self, key: str, status_code: Optional[int] = None) -> bool:
+        """Record how a request made with ``key`` ended.
+
+        ``status_code`` is the upstream status, or ``None`` when no response
+        arrived. Only refusals (401/403/429) and server errors count as
+        failures; 400/404 are about the query, not the key. Returns True if
+        the key itself was refused, in which case the request may be retried
+        with another key.
+        """
+        with self._lock:
+            state = self._by_value[key]
+            state.in_flight = max(0, state.in_flight - 1)
+            if status_code is None:
+                return False
+            if status_code < 400:
+                state.consecutive_rate_limits = 0
+                return False
+            if status_code >= _SERVER_ERROR:
+                state.failures += 1
+                return False
+
+            now = self._clock()
+            if status_code == _RATE_LIMITED:
+                state.failures += 1
+                state.rate_limited += 1
+                state.consecutive_rate_limits += 1
+                delay = _RATE_LIMIT_COOLDOWN * 2 ** (state.consecutive_rate_limits - 1)
+                state.cooldown_until = now + min(delay, _RATE_LIMIT_COOLDOWN_MAX)
+                return True
+            if status_code in _REJECTED:
+                state.failures += 1
+                state.rejected += 1
+                state.cooldown_until = now + _AUTH_COOLDOWN
+                return True
+            return False
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-key counters keyed by a masked form of the key."""
+        with self._lock:
+            now = self._clock()
+            return {
+                _mask(state.key.value): {
+                    "weight": state.key.weight,
+                    "requests": state.requests,
+                    "last_minute": state.used(now),
+                    "in_flight": state.in_flight,
+                    "failures": state.failures,
+                    "rate_limited": state.rate_limited,
+                    "rejected": state.rejected,
+                    "healthy": state.cooldown_until <= now,
+                    "cooldown_s": round(max(0.0, state.cooldown_until - now), 1),
+                }
+                for state in self._states
+            }
+
+
+def _mask(key: str) -> str:
+    """Enough of a key to tell keys apart in monitoring without exposing it."""
+    if len(key) <= 8:
+        return "*" * len(key)
+    return f"{key[:4]}…{key[-4:]}"
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 
 @dataclass(frozen=True)
@@ -49,3 +50,64 @@ class WeatherReport:
             return f"{self.city}, {self.country}"
         return self.city
 
+
+@dataclass(frozen=True)
+class BoundingBox:
+    """Geographic rectangle expressed in decimal degrees."""
+
+    lon_left: float
+    lat_bottom: float
+    lon_right: float
+    lat_top: float
+
+    def __post_init__(self) -> None:
+        if not -180.0 <= self.lon_left < self.lon_right <= 180.0:
+            raise ValueError("Longitude bounds must satisfy -180 <= left < right <= 180.")
+        if not -90.0 <= self.lat_bottom < self.lat_top <= 90.0:
+            raise ValueError("Latitude bounds must satisfy -90 <= bottom < top <= 90.")
+
+    @classmethod
+    def parse(cls, value: str) -> "BoundingBox":
+        """Parse a ``lon_left,lat_bottom,lon_right,lat_top`` string."""
+        parts = [part.strip() for part in value.split(",")]
+        if len(parts) != 4:
+            raise ValueError("Bounding box must be 'lon_left,lat_bottom,lon_right,lat_top'.")
+        try:
+            coordinates = [float(part) for part in parts]
+        except ValueError as exc:
+            raise ValueError("Bounding box coordinates must be numeric.") from exc
+        return cls(*coordinates)
+
+    def tiles(self, max_span: float, max_tiles: Optional[int] = None) -> List["BoundingBox"]:
+        """Split the box into a grid of tiles no wider or taller than ``max_span`` degrees.
+
+        Raises ``ValueError`` if that takes more than ``max_tiles`` tiles.
+        """
+        if max_span <= 0:
+            raise ValueError("Tile span must be positive.")
+        columns = max(1, math.ceil((self.lon_right - self.lon_left) / max_span))
+        rows = max(1, math.ceil((self.lat_top - self.lat_bottom) / max_span))
+        if max_tiles is not None and columns * rows > max_tiles:
+            raise ValueError(
+                f"Bounding box is too large: it needs {columns * rows} tiles of "
+                f"{max_span:g} degrees, at most {max_tiles} are allowed."
+            )
+        lon_step = (self.lon_right - self.lon_left) / columns
+        lat_step = (self.lat_top - self.lat_bottom) / rows
+
+        return [
+            BoundingBox(
+                lon_left=self.lon_left + col * lon_step,
+                lat_bottom=self.lat_bottom + row * lat_step,
+                lon_right=self.lon_left + (col + 1) * lon_step,
+                lat_top=self.lat_bottom + (row + 1) * lat_step,
+            )
+            for row in range(rows)
+            for col in range(columns)
+        ]
+
+    def to_param(self, zoom: int) -> str:
+        """Render the box in the ``bbox`` query format used by OpenWeatherMap."""
+        return (
+            f"{self.lon_left:g},{self.lat_bottom:g},{self.lon_right:g},{self.lat_top:g},{zoom}"
+        )
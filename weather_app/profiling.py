@@ -0,0 +1,204 @@
+"""Opt-in sampling profiler with per-phase timings.
+
+Instrumented code wraps its phases in :func:`phase`. When no profiler is
+active in the current context that is a single context-variable lookup, so
+the hooks can stay in place permanently. Work handed to worker threads must
+run in a copy of the caller's context (``contextvars.copy_context().run``)
+for its phases to be recorded.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar, Token
+from pathlib import Path
+from typing import ContextManager, Dict, Iterator, List, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+_DEFAULT_INTERVAL = 0.005  # seconds between stack samples
+_MAX_STACK_DEPTH = 128
+
+_active: ContextVar[Optional["Profiler"]] = ContextVar("weather_app_profiler", default=None)
+_NULL_CONTEXT = nullcontext()
+
+
+def phase(name: str) -> ContextManager[object]:
+    """Time the enclosed block under ``name`` if a profiler is active."""
+    profiler = _active.get()
+    if profiler is None:
+        return _NULL_CONTEXT
+    return profiler.phase(name)
+
+
+def record(name: str, seconds: float) -> None:
+    """Add an externally measured duration to the active profiler, if any."""
+    profiler = _active.get()
+    if profiler is not None:
+        profiler.add_timing(name, seconds)
+
+
+class Profiler:
+    """Collects stack samples of one thread plus named phase timings."""
+
+    def __init__(self, *, interval: float = _DEFAULT_INTERVAL) -> None:
+        self._interval = interval
+        self._samples: Counter[str] = Counter()
+        self._timings: Dict[str, List[float]] = defaultdict(list)
+        self._timings_lock = threading.Lock()  # worker threads record phases too
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._token: Optional[Token] = None
+        self._started_at = 0.0
+        self._duration = 0.0
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Activate phase timing in this context and start sampling the calling thread."""
+        self._token = _active.set(self)
+        self._started_at = time.perf_counter()
+        target = threading.get_ident()
+        self._sampler = threading.Thread(
+            target=self._sample_loop, args=(target,), name="weather-profiler", daemon=True
+        )
+        self._sampler.start()
+
+    @property
+    def running(self) -> bool:
+        return self._token is not None
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        if self._token is not None:
+            _active.reset(self._token)
+            with self._timings_lock:
+                self._token = None
+        self._duration = time.perf_counter() - self._started_at
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_timing(name, time.perf_counter() - started)
+
+    def add_timing(self, name: str, seconds: float) -> None:
+        with self._timings_lock:
+            # A worker still running after stop() (e.g. a lost race) is not counted.
+            if self.running:
+                self._timings[name].append(seconds)
+
+    def _timings_snapshot(self) -> Dict[str, List[float]]:
+        with self._timings_lock:
+            return {name: list(values) for name, values in self._timings.items()}
+
+    def collapsed(self) -> str:
+        """Render samples in the collapsed-stack format used by flamegraph tools."""
+        return "".join(f"{stack} {count}\n" for stack, count in self._samples.most_common())
+
+    def write_collapsed(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.collapsed(), encoding="utf-8")
+        return path
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "duration_ms": round(self._duration * 1000, 3),
+            "samples": sum(self._samples.values()),
+            "phases": {
+                name: {"count": len(values), "total_ms": round(sum(values) * 1000, 3)}
+                for name, values in self._timings_snapshot().items()
+            },
+        }
+
+    def server_timing(self) -> str:
+        """Render phase totals as an HTTP ``Server-Timing`` header value."""
+        return ", ".join(
+            f"{name.replace('.', '-')};dur={sum(values) * 1000:.3f}"
+            for name, values in self._timings_snapshot().items()
+        )
+
+    def format_summary(self) -> str:
+        summary = self.summary()
+        lines = [f"Profile: {summary['duration_ms']:.1f} ms, {summary['samples']} samples"]
+        for name, stats in summary["phases"].items():  # type: ignore[union-attr]
+            lines.append(f"  {name:<20} {stats['total_ms']:>10.3f} ms  x{stats['count']}")
+        return "\n".join(lines)
+
+    def _sample_loop(self, target: int) -> None:
+        own_file = os.path.abspath(__file__)
+        while not self._stop.wait(self._interval):
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                continue
+            stack: List[str] = []
+            while frame is not None and len(stack) < _MAX_STACK_DEPTH:
+                code = frame.f_code
+                if code.co_filename != own_file:
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self._samples[";".join(reversed(stack))] += 1
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):  # type: ignore[override]
+        with phase("upstream.connect"):
+            return super()._new_conn()
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    _tcp_seconds = 0.0
+
+    def _new_conn(self):  # type: ignore[override]
+        started = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            self._tcp_seconds = time.perf_counter() - started
+            record("upstream.connect", self._tcp_seconds)
+
+    def connect(self) -> None:
+        if _active.get() is None:
+            return super().connect()
+        started = time.perf_counter()
+        super().connect()
+        record("upstream.tls", time.perf_counter() - started - self._tcp_seconds)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Transport adapter that reports TCP connect and TLS handshake phases."""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:  # type: ignore[override]
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
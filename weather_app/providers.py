@@ -0,0 +1,484 @@
+"""Pluggable weather backends with per-provider health tracking.
+
+Every provider turns a location query into an :class:`Observation` in metric
+units, so the client's cache and unit/language handling work the same no
+matter which backend answered. :class:`ProviderPool` decides which provider
+to ask: ``"failover"`` tries healthy providers in order of observed latency,
+``"race"`` asks the two best candidates at once and keeps the first valid
+answer. A "not found" from a provider with partial coverage moves on to the
+next provider; it is final only from an ``authoritative`` provider or when
+every provider agrees.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import requests
+
+from .config import Settings
+from .exceptions import LocationNotFoundError, NetworkError, WeatherAppError, WeatherServiceError
+from .keys import ApiKeyPool
+from .models import WeatherReport
+from .profiling import TimedHTTPAdapter, phase
+
+_logger = logging.getLogger(__name__)
+_API_ROOT = os.getenv("OPENWEATHER_API_ROOT", "https://api.openweathermap.org/data/2.5").rstrip("/")
+_BASE_URL = f"{_API_ROOT}/weather"
+_BOX_URL = f"{_API_ROOT}/box/city"
+_DEFAULT_TIMEOUT = 10  # seconds
+# Upstream statuses that depend only on the query text (a bad or unknown
+# location) rather than on the health of the provider that returned them.
+QUERY_ERROR_STATUSES = frozenset({400, 404})
+_LATENCY_SMOOTHING = 0.2  # weight of the newest sample in the latency EWMA
+_FAILURE_THRESHOLD = 3  # consecutive failures before a provider is benched
+_COOLDOWN_BASE = 5.0  # seconds; doubles with every further failure
+_COOLDOWN_MAX = 300.0
+# seconds a failure keeps a provider ranked behind the others; afterwards it
+# competes on latency again, so one transient error does not demote it for good
+_FAILURE_MEMORY = 30.0
+_RACE_WIDTH = 2
+_RACE_WORKERS = 16  # per provider, so a slow backend only ties up its own threads
+STRATEGIES = ("failover", "race")
+
+
+@dataclass(frozen=True)
+class Observation:
+    """Canonical (metric) report plus what is needed to localize it."""
+
+    report: WeatherReport
+    condition_id: Optional[int]
+    language: str
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any], language: str) -> "Observation":
+        with phase("parse"):
+            report = WeatherReport.from_openweather(payload)
+        condition_id = ((payload.get("weather") or [{}])[0]).get("id")
+        return cls(report=report, condition_id=condition_id, language=language)
+
+
+def create_session() -> requests.Session:
+    """A pooled session whose connect/TLS time shows up in profiles."""
+    session = requests.Session()
+    adapter = TimedHTTPAdapter()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fetch_json(
+    session: requests.Session, url: str, params: Dict[str, Any], keys: ApiKeyPool
+) -> Dict[str, Any]:
+    """GET an OpenWeatherMap endpoint with a key from ``keys`` and return the JSON body.
+
+    A key refused with 401/403/429 is put on cooldown and the request is
+    retried with another key, once per configured key.
+    """
+    for attempt in range(len(keys)):
+        key = keys.acquire()
+        try:
+            payload = _get_json(session, url, {**params, "appid": key})
+        except WeatherServiceError as exc:
+            if keys.release(key, exc.status_code) and attempt + 1 < len(keys):
+                continue
+            raise
+        except NetworkError:
+            keys.release(key)
+            raise
+        keys.release(key, 200)
+        return payload
+    raise AssertionError("unreachable")
+
+
+def _get_json(session: requests.Session, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        # Headers and body are read separately so the profiler can tell
+        # server wait time (including connect/TLS) apart from transfer.
+        with phase("upstream.request"):
+            response = session.get(url, params=params, timeout=_DEFAULT_TIMEOUT, stream=True)
+        with phase("upstream.transfer"):
+            _ = response.content
+    except requests.RequestException as exc:
+        _logger.exception("Network failure while fetching weather data.")
+        raise NetworkError("Unable to reach the OpenWeatherMap service.") from exc
+
+    return _parse_payload(response.status_code, response.reason, response.json)
+
+
+def _parse_payload(
+    status_code: int, reason: Optional[str], read_json: Callable[[], Any]
+) -> Dict[str, Any]:
+    """Validate an upstream response independently of the HTTP library that fetched it."""
+    if status_code >= 400:
+        try:
+            payload = read_json()
+        except ValueError:
+            payload = {}
+        if not isinstance(payload, dict):
+            payload = {}
+
+        message = payload.get("message") or reason
+        error_type = LocationNotFoundError if status_code == 404 else WeatherServiceError
+        raise error_type(
+            f"OpenWeatherMap request failed [{status_code}]: {message}", status_code=status_code
+        )
+
+    try:
+        with phase("json.decode"):
+            return read_json()
+    except ValueError as exc:
+        raise WeatherServiceError("OpenWeatherMap returned invalid JSON.") from exc
+
+
+def is_query_error(error: BaseException) -> bool:
+    """Whether ``error`` is about the query itself rather than the provider."""
+    return isinstance(error, WeatherServiceError) and error.status_code in QUERY_ERROR_STATUSES
+
+
+class ProviderMetrics:
+    """Thread-safe request counters, latency EWMA and failure cooldown for one provider."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.latency: Optional[float] = None
+        self.cooldown_until = 0.0
+        self.last_failure: Optional[float] = None
+
+    @property
+    def healthy(self) -> bool:
+        return self._clock() >= self.cooldown_until
+
+    @property
+    def recently_failed(self) -> bool:
+        """True if the last request failed less than ``_FAILURE_MEMORY`` seconds ago."""
+        return (
+            self.consecutive_failures > 0
+            and self.last_failure is not None
+            and self._clock() - self.last_failure < _FAILURE_MEMORY
+        )
+
+    def record_success(self, elapsed: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.consecutive_failures = 0
+            self.cooldown_until = 0.0
+            self._observe(elapsed)
+
+    def record_failure(self, elapsed: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_failure = self._clock()
+            self._observe(elapsed)
+            excess = self.consecutive_failures - _FAILURE_THRESHOLD
+            if excess >= 0:
+                delay = min(_COOLDOWN_BASE * 2**excess, _COOLDOWN_MAX)
+                self.cooldown_until = self._clock() + delay
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "failures": self.failures,
+                "consecutive_failures": self.consecutive_failures,
+                "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+                "healthy": self._clock() >= self.cooldown_until,
+                "cooldown_s": round(max(0.0, self.cooldown_until - self._clock()), 1),
+            }
+
+    def _observe(self, elapsed: float) -> None:
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency += _LATENCY_SMOOTHING * (elapsed - self.latency)
+
+
+class WeatherProvider(ABC):
+    """A weather backend; subclasses implement :meth:`_fetch`.
+
+    ``authoritative`` providers cover every location, so their "not found"
+    ends a lookup; for the others the next provider is asked.
+    """
+
+    name = "provider"
+    authoritative = False
+
+    def __init__(self, *, authoritative: Optional[bool] = None) -> None:
+        self.metrics = ProviderMetrics()
+        if authoritative is not None:
+            self.authoritative = authoritative
+
+    def fetch(self, query: str, language: str) -> Observation:
+        """Fetch ``query`` in metric units, recording latency and health."""
+        started = time.perf_counter()
+        try:
+            observation = self._fetch(query, language)
+        except WeatherAppError as exc:
+            elapsed = time.perf_counter() - started
+            # The provider answered correctly; the query was the problem.
+            if is_query_error(exc):
+                self.metrics.record_success(elapsed)
+            else:
+                self.metrics.record_failure(elapsed)
+            raise
+        self.metrics.record_success(time.perf_counter() - started)
+        return observation
+
+    @abstractmethod
+    def _fetch(self, query: str, language: str) -> Observation:
+        """Return the current observation for ``query`` in metric units."""
+
+    def close(self) -> None:
+        """Release connections held by the provider."""
+
+
+class OpenWeatherProvider(WeatherProvider):
+    """OpenWeatherMap current weather endpoint on its own connection pool."""
+
+    name = "openweathermap"
+    authoritative = True
+
+    def __init__(
+        self,
+        settings: Settings,
+        *,
+        session: Optional[requests.Session] = None,
+        keys: Optional[ApiKeyPool] = None,
+        base_url: str = _BASE_URL,
+        authoritative: Optional[bool] = None,
+    ) -> None:
+        super().__init__(authoritative=authoritative)
+        self._session = session or create_session()
+        self._owns_keys = keys is None
+        self._keys = keys or ApiKeyPool(settings.keys())
+        self._base_url = base_url
+
+    def share_keys(self, keys: ApiKeyPool) -> None:
+        """Use ``keys`` instead of a private pool built for the same keys.
+
+        Quotas are per key, so every user of a key must draw from one pool.
+        A pool passed to the constructor is kept.
+        """
+        if self._owns_keys and keys.keys == self._keys.keys:
+            self._keys = keys
+            self._owns_keys = False
+
+    def _fetch(self, query: str, language: str) -> Observation:
+        params = {"q": query, "units": "metric", "lang": language}
+        payload = fetch_json(self._session, self._base_url, params, self._keys)
+        return Observation.from_payload(payload, language)
+
+    def close(self) -> None:
+        self._session.close()
+
+
+class StaticProvider(WeatherProvider):
+    """In-process stand-in serving fixed reports, for tests and offline demos.
+
+    ``latency`` adds an artificial delay and ``fail`` makes every call raise
+    :class:`NetworkError`, which is enough to exercise racing and failover.
+    """
+
+    name = "static"
+
+    def __init__(
+        self,
+        reports: Mapping[str, WeatherReport],
+        *,
+        name: Optional[str] = None,
+        latency: float = 0.0,
+        fail: bool = False,
+        authoritative: Optional[bool] = None,
+    ) -> None:
+        super().__init__(authoritative=authoritative)
+        self.name = name or self.name
+        self._reports = {key.casefold(): report for key, report in reports.items()}
+        self.latency = latency
+        self.fail = fail
+
+    def _fetch(self, query: str, language: str) -> Observation:
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail:
+            raise NetworkError(f"Provider '{self.name}' is unavailable.")
+
+        report = self._reports.get(query.casefold()) or self._reports.get(
+            query.split(",")[0].strip().casefold()
+        )
+        if report is None:
+            raise LocationNotFoundError(
+                f"Provider '{self.name}' has no data for '{query}'.", status_code=404
+            )
+        return Observation(report=replace(report), condition_id=None, language=language)
+
+
+def _final_error(errors: List[Tuple[WeatherAppError, bool]]) -> WeatherAppError:
+    """The error to raise once every provider failed; ``errors`` pairs each
+    error with whether its provider was healthy when asked.
+
+    "Not found" counts only if every healthy provider said so; otherwise one
+    that could not be asked might have known the location, so its transport
+    failure (which is never cached) wins.
+    """
+    assert errors
+    found = [error for error, _ in errors if is_query_error(error)]
+    vetoes = [
+        error for error, healthy in errors if not is_query_error(error) and (healthy or not found)
+    ]
+    return vetoes[-1] if vetoes else found[-1]
+
+
+class ProviderPool:
+    """Chooses which providers answer a lookup.
+
+    Providers are ranked by health, then by whether their last call failed
+    (so a backend that fails fast is not mistaken for a fast one), then by
+    smoothed latency; ties keep their configured order.
+    """
+
+    def __init__(self, providers: Sequence[WeatherProvider], *, strategy: str = "failover") -> None:
+        if not providers:
+            raise ValueError("At least one weather provider is required.")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unsupported strategy '{strategy}'. Choose from: {', '.join(STRATEGIES)}.")
+        names = [provider.name for provider in providers]
+        if len(set(names)) != len(names):
+            raise ValueError("Weather provider names must be unique.")
+
+        self.providers: List[WeatherProvider] = list(providers)
+        self.strategy = strategy
+        # Each provider races on its own bounded executor; a provider whose
+        # workers are all busy (typically with lost races) is left out.
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._in_flight: Dict[str, int] = {name: 0 for name in names}
+        self._executor_lock = threading.Lock()
+
+    def ranked(self) -> List[WeatherProvider]:
+        def rank(item: tuple) -> tuple:
+            position, provider = item
+            latency = provider.metrics.latency
+            return (
+                not provider.metrics.healthy,
+                provider.metrics.recently_failed,
+                latency if latency is not None else 0.0,
+                position,
+            )
+
+        return [provider for _, provider in sorted(enumerate(self.providers), key=rank)]
+
+    def fetch(self, query: str, language: str) -> Observation:
+        candidates = self.ranked()
+        if self.strategy == "race" and len(candidates) > 1:
+            return self._race(candidates[:_RACE_WIDTH], query, language)
+        return self._failover(candidates, query, language)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {provider.name: provider.metrics.snapshot() for provider in self.providers}
+
+    def close(self) -> None:
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        for provider in self.providers:
+            provider.close()
+
+    def _failover(
+        self,
+        candidates: Iterable[WeatherProvider],
+        query: str,
+        language: str,
+        errors: Optional[List[Tuple[WeatherAppError, bool]]] = None,
+    ) -> Observation:
+        errors = errors if errors is not None else []
+        candidates = list(candidates)
+        for position, provider in enumerate(candidates):
+            healthy = provider.metrics.healthy
+            try:
+                return provider.fetch(query, language)
+            except WeatherAppError as exc:
+                if is_query_error(exc) and provider.authoritative:
+                    raise
+                if position + 1 < len(candidates):
+                    _logger.warning(
+                        "Provider '%s' failed, trying the next one: %s", provider.name, exc
+                    )
+                errors.append((exc, healthy))
+        raise _final_error(errors)
+
+    def _race(self, candidates: List[WeatherProvider], query: str, language: str) -> Observation:
+        # One snapshot: the averages keep moving while other races finish.
+        latencies = [provider.metrics.latency for provider in candidates]
+        fastest = min((latency for latency in latencies if latency is not None), default=None)
+        providers: Dict["Future[Observation]", Tuple[WeatherProvider, bool]] = {}
+        for position, (provider, latency) in enumerate(zip(candidates, latencies)):
+            # Only providers already known to be slower are dropped when busy;
+            # the best-ranked and fastest ones may queue, as their queues drain quickly.
+            may_queue = position == 0 or latency is None or fastest is None or latency <= fastest
+            future = self._submit(provider, query, language, may_queue=may_queue)
+            if future is not None:
+                providers[future] = (provider, provider.metrics.healthy)
+        if not providers:
+            # Every candidate is saturated; answer inline rather than queueing.
+            return self._failover(candidates, query, language)
+        pending = set(providers)
+        errors: List[Tuple[WeatherAppError, bool]] = []
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    # The slower request keeps running so its latency and
+                    # health still count; its result is simply ignored.
+                    return future.result()
+                if not isinstance(error, WeatherAppError):
+                    raise error
+                provider, healthy = providers[future]
+                if is_query_error(error) and provider.authoritative:
+                    raise error
+                errors.append((error, healthy))
+
+        # Nobody answered: fall back to the providers that were not raced.
+        raced = {provider for provider, _ in providers.values()}
+        remaining = [provider for provider in self.ranked() if provider not in raced]
+        return self._failover(remaining, query, language, errors)
+
+    def _submit(
+        self, provider: WeatherProvider, query: str, language: str, *, may_queue: bool
+    ) -> Optional["Future[Observation]"]:
+        """Start ``provider.fetch`` on its own executor.
+
+        Returns None instead when every worker is busy and ``may_queue`` is
+        false, so lost races against a slow provider cannot pile up.
+        """
+        with self._executor_lock:
+            if self._in_flight[provider.name] >= _RACE_WORKERS and not may_queue:
+                return None
+            self._in_flight[provider.name] += 1
+            executor = self._executors.get(provider.name)
+            if executor is None:
+                executor = self._executors[provider.name] = ThreadPoolExecutor(
+                    max_workers=_RACE_WORKERS, thread_name_prefix=f"weather-{provider.name}"
+                )
+
+        # Run in a copy of the caller's context so an active profiler sees the request.
+        future = executor.submit(copy_context().run, provider.fetch, query, language)
+        future.add_done_callback(lambda _: self._finished(provider.name))
+        return future
+
+    def _finished(self, name: str) -> None:
+        with self._executor_lock:
+            self._in_flight[name] -= 1
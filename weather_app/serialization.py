@@ -0,0 +1,120 @@
+"""JSON serialization and compression of weather reports for the web frontends."""
+
+from __future__ import annotations
+
+import gzip
+import json
+from dataclasses import fields as dataclass_fields
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:  # Brotli is optional; gzip is always available.
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+from .cache import TTLCache
+from .models import WeatherReport
+from .profiling import phase
+
+COMPRESS_MIN_BYTES = 256  # smaller bodies are not worth the CPU or the header overhead
+_BODY_CACHE_TTL = 600  # seconds; matches the client's report cache
+
+_DERIVED_FIELDS: Dict[str, Callable[[WeatherReport], Any]] = {
+    "display_name": lambda report: report.display_name(),
+    "timestamp_iso": lambda report: report.timestamp.astimezone().isoformat(),
+    "timestamp_local": lambda report: report.timestamp.astimezone().strftime("%Y-%m-%d %H:%M"),
+}
+REPORT_FIELDS: Tuple[str, ...] = tuple(
+    field.name for field in dataclass_fields(WeatherReport)
+) + tuple(_DERIVED_FIELDS)
+
+ENCODERS: Dict[str, Callable[[bytes], bytes]] = {"gzip": lambda body: gzip.compress(body, 6)}
+if brotli is not None:
+    ENCODERS["br"] = lambda body: brotli.compress(body, quality=5)
+
+# Encoded bodies keyed by (report, fields, encoding). Reports come from the
+# client cache, so a cache hit reuses the already-compressed bytes.
+_body_cache: TTLCache[Tuple[bytes, Optional[str]]] = TTLCache(maxsize=2048, ttl=_BODY_CACHE_TTL)
+
+
+def serialize_report(
+    report: WeatherReport, fields: Tuple[str, ...] = REPORT_FIELDS
+) -> Dict[str, Any]:
+    data: Dict[str, Any] = {}
+    for name in fields:
+        derive = _DERIVED_FIELDS.get(name)
+        data[name] = derive(report) if derive else getattr(report, name)
+    return data
+
+
+def parse_fields(value: Optional[str]) -> Tuple[str, ...]:
+    """Resolve a ``fields=`` projection, preserving the canonical field order."""
+    if not value:
+        return REPORT_FIELDS
+
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested.difference(REPORT_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(sorted(unknown))}. "
+            f"Choose from: {', '.join(REPORT_FIELDS)}."
+        )
+    return tuple(name for name in REPORT_FIELDS if name in requested)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported encoding from an ``Accept-Encoding`` header."""
+    accepted: Dict[str, float] = {}
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.lower()] = quality
+
+    for encoding in ("br", "gzip"):
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if encoding in ENCODERS and quality > 0:
+            return encoding
+    return None
+
+
+def dumps(payload: Any) -> bytes:
+    """Compact JSON matching Flask's provider (datetimes become HTTP dates)."""
+    return json.dumps(payload, separators=(",", ":"), sort_keys=True, default=_default).encode(
+        "utf-8"
+    )
+
+
+def encode_report(
+    report: WeatherReport, fields: Tuple[str, ...], accepted: Optional[str]
+) -> Tuple[bytes, Optional[str]]:
+    """Return the (possibly compressed) ``{"data": ...}`` body and its content encoding."""
+    cache_key = (report, fields, accepted)
+    cached = _body_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    with phase("serialize"):
+        body = dumps({"data": serialize_report(report, fields)})
+    encoding = None
+    if accepted is not None and len(body) >= COMPRESS_MIN_BYTES:
+        with phase("compress"):
+            body = ENCODERS[accepted](body)
+        encoding = accepted
+
+    cached = (body, encoding)
+    _body_cache.set(cache_key, cached)
+    return cached
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,62 @@
+"""Local conversion between OpenWeatherMap unit systems."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Dict, List, Sequence, Tuple
+
+from .models import WeatherReport
+
+# Reports are fetched and cached in this system and converted on the way out.
+CANONICAL_UNITS = "metric"
+
+_KELVIN_OFFSET = 273.15
+_METRES_PER_SECOND_PER_MPH = 0.44704
+_PRECISION = 2  # OpenWeatherMap reports values to two decimal places
+
+# Linear (scale, offset) transforms from canonical metric values.
+_TEMPERATURE: Dict[str, Tuple[float, float]] = {
+    "metric": (1.0, 0.0),
+    "imperial": (9.0 / 5.0, 32.0),
+    "standard": (1.0, _KELVIN_OFFSET),
+}
+_WIND_SPEED: Dict[str, Tuple[float, float]] = {
+    "metric": (1.0, 0.0),
+    "imperial": (1.0 / _METRES_PER_SECOND_PER_MPH, 0.0),
+    "standard": (1.0, 0.0),
+}
+
+
+def _transforms(units: str) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+    try:
+        return _TEMPERATURE[units], _WIND_SPEED[units]
+    except KeyError:
+        raise ValueError(f"Unsupported units '{units}'.") from None
+
+
+def _apply(column: Sequence[float], transform: Tuple[float, float]) -> List[float]:
+    scale, offset = transform
+    if scale == 1.0 and offset == 0.0:
+        return list(column)
+    return [round(value * scale + offset, _PRECISION) for value in column]
+
+
+def convert_report(report: WeatherReport, units: str) -> WeatherReport:
+    """Convert a canonical (metric) report into ``units``."""
+    return convert_reports([report], units)[0]
+
+
+def convert_reports(reports: Sequence[WeatherReport], units: str) -> List[WeatherReport]:
+    """Convert canonical (metric) reports into ``units`` column by column."""
+    temperature, wind_speed = _transforms(units)
+    if units == CANONICAL_UNITS:
+        return list(reports)
+
+    temperatures = _apply([report.temperature for report in reports], temperature)
+    feels_like = _apply([report.feels_like for report in reports], temperature)
+    wind_speeds = _apply([report.wind_speed for report in reports], wind_speed)
+
+    return [
+        replace(report, temperature=temp, feels_like=feels, wind_speed=wind)
+        for report, temp, feels, wind in zip(reports, temperatures, feels_like, wind_speeds)
+    ]
@@ -2,29 +2,217 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict
-from typing import Any, Dict
+import os
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Tuple
 
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, g, jsonify, render_template, request
 
+from weather_app.alerts import Alert, AlertConfig, AlertEngine
 from weather_app.api import OpenWeatherClient
-from weather_app.config import ConfigurationError, get_settings
-from weather_app.exceptions import WeatherAppError
+from weather_app.config import ApiKey, ConfigurationError, Settings, get_settings
+from weather_app.exceptions import LocationNotFoundError, WeatherAppError
+from weather_app.icons import IconStore
+from weather_app.models import BoundingBox, WeatherReport
+from weather_app.profiling import Profiler, phase
+from weather_app.serialization import (
+    encode_report,
+    negotiate_encoding,
+    parse_fields,
+    serialize_report,
+)
+from weather_app.units import CANONICAL_UNITS
 
 app = Flask(__name__, template_folder="frontend/templates", static_folder="frontend/static")
 
+_ICON_CACHE_CONTROL = "public, max-age=31536000, immutable"
+_SPRITE_CACHE_CONTROL = "public, max-age=86400"
+_icon_store = IconStore()
 
-def _serialize_report(report) -> Dict[str, Any]:
-    data = asdict(report)
-    timestamp = report.timestamp.astimezone()
-    data.update(
-        {
-            "display_name": report.display_name(),
-            "timestamp_iso": timestamp.isoformat(),
-            "timestamp_local": timestamp.strftime("%Y-%m-%d %H:%M"),
-        }
+# Profiling is opt-in: a fraction of traffic via WEATHER_PROFILE_SAMPLE_RATE,
+# or individual requests carrying the header when WEATHER_PROFILE_ALLOW_HEADER=1.
+_PROFILE_HEADER = "X-Weather-Profile"
+_PROFILE_SAMPLE_RATE = float(os.getenv("WEATHER_PROFILE_SAMPLE_RATE", "0"))
+_PROFILE_ALLOW_HEADER = os.getenv("WEATHER_PROFILE_ALLOW_HEADER", "0") == "1"
+_PROFILE_DIR = Path(os.getenv("WEATHER_PROFILE_DIR", "profiles"))
+# Only the newest profiles are kept; a profile's .folded file is deleted with it.
+_profile_summaries: Deque[Dict[str, Any]] = deque(maxlen=200)
+_profile_lock = threading.Lock()
+
+# Background threshold alerts: WEATHER_ALERTS_FILE names a JSON file with
+# rules, locations and the pass interval. The job starts with the first request
+# and loads the file itself, so a broken file is logged instead of stopping the app.
+_ALERTS_FILE = os.getenv("WEATHER_ALERTS_FILE")
+_ALERT_WORKERS = 8
+_ALERT_RETRY_INTERVAL = 60.0  # seconds before retrying after a failed load or pass
+_alert_config: Optional[AlertConfig] = None
+_alert_engine: Optional[AlertEngine] = None
+_alert_error: Optional[str] = None
+_recent_alerts: Deque[Dict[str, Any]] = deque(maxlen=500)
+_alert_lock = threading.Lock()
+_alert_job: Optional[threading.Thread] = None
+
+
+@lru_cache(maxsize=4)
+def _client_for(keys: Tuple[ApiKey, ...]) -> OpenWeatherClient:
+    """Share one client (and its cache, connection pool and key pool) per key set.
+
+    The client caches unit- and language-agnostic observations, so callers
+    pass the resolved units and language on every lookup instead.
+    """
+    return OpenWeatherClient(settings=Settings(api_key=keys[0].value, api_keys=keys))
+
+
+def _report_response(report: WeatherReport, fields: Tuple[str, ...]) -> Response:
+    accepted = negotiate_encoding(request.headers.get("Accept-Encoding"))
+    body, encoding = encode_report(report, fields, accepted)
+
+    response = app.response_class(body, mimetype="application/json")
+    response.vary.add("Accept-Encoding")
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def _should_profile() -> bool:
+    if not request.path.startswith("/api/") or request.path.startswith("/api/profile"):
+        return False
+    if _PROFILE_ALLOW_HEADER and request.headers.get(_PROFILE_HEADER) == "1":
+        return True
+    return _PROFILE_SAMPLE_RATE > 0 and random.random() < _PROFILE_SAMPLE_RATE
+
+
+@app.before_request
+def _start_profiler() -> None:
+    if _should_profile():
+        g.profiler = Profiler()
+        g.profiler.start()
+
+
+@app.after_request
+def _finish_profiler(response: Response) -> Response:
+    profiler: Optional[Profiler] = g.pop("profiler", None)
+    if profiler is None:
+        return response
+
+    profiler.stop()
+    profile_id = uuid.uuid4().hex[:12]
+    path = profiler.write_collapsed(
+        _PROFILE_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}-{request.endpoint}-{profile_id}.folded"
     )
-    return data
+    evicted: Optional[Dict[str, Any]] = None
+    with _profile_lock:
+        if len(_profile_summaries) == _profile_summaries.maxlen:
+            evicted = _profile_summaries.popleft()
+        _profile_summaries.append(
+            {
+                "id": profile_id,
+                "endpoint": request.endpoint,
+                "path": request.full_path,
+                "status": response.status_code,
+                "collapsed_stacks": str(path),
+                **profiler.summary(),
+            }
+        )
+    if evicted is not None:
+        try:
+            Path(evicted["collapsed_stacks"]).unlink(missing_ok=True)
+        except OSError:
+            app.logger.warning("Could not delete profile %s.", evicted["collapsed_stacks"])
+
+    response.headers["Server-Timing"] = profiler.server_timing()
+    response.headers[_PROFILE_HEADER + "-Id"] = profile_id
+    return response
+
+
+@app.teardown_request
+def _discard_profiler(exc: Optional[BaseException]) -> None:
+    # Only reached with a live profiler when the view raised.
+    profiler: Optional[Profiler] = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.stop()
+
+
+@app.before_request
+def _start_alert_job() -> None:
+    global _alert_job
+    if _ALERTS_FILE is None or _alert_job is not None:
+        return
+    with _alert_lock:
+        if _alert_job is None:
+            _alert_job = threading.Thread(target=_run_alerts, name="weather-alerts", daemon=True)
+            _alert_job.start()
+
+
+def _run_alerts() -> None:
+    """Evaluate the alert rules forever; failures are logged and retried, never fatal."""
+    global _alert_config, _alert_engine, _alert_error
+    assert _ALERTS_FILE is not None
+    while True:
+        interval = _ALERT_RETRY_INTERVAL
+        try:
+            if _alert_config is None:
+                config = AlertConfig.load(_ALERTS_FILE)
+                if not config.locations:
+                    raise ValueError(f"{_ALERTS_FILE} must list the locations to monitor.")
+                with _alert_lock:
+                    _alert_config, _alert_engine = config, AlertEngine(config.rules)
+            interval = _alert_config.interval
+            _alert_pass(_client_for(get_settings().keys()), _alert_config)
+        except (ConfigurationError, ValueError) as exc:
+            _alert_error = str(exc)
+            app.logger.error("Weather alerts paused: %s", exc)
+        except Exception:
+            _alert_error = "Alert pass failed; see the server log."
+            app.logger.exception("Weather alert pass failed.")
+        else:
+            _alert_error = None
+        time.sleep(interval)
+
+
+def _alert_pass(client: OpenWeatherClient, config: AlertConfig) -> None:
+    with ThreadPoolExecutor(max_workers=_ALERT_WORKERS) as executor:
+        fetched = executor.map(lambda location: _alert_report(client, location), config.locations)
+        reports = {
+            location: report
+            for location, report in zip(config.locations, fetched)
+            if report is not None
+        }
+    with _alert_lock:
+        assert _alert_engine is not None
+        alerts = _alert_engine.evaluate(reports)
+        _recent_alerts.extend(_alert_to_dict(alert) for alert in alerts)
+    for alert in alerts:
+        app.logger.warning("Weather alert %s", alert.message())
+
+
+def _alert_report(client: OpenWeatherClient, location: str) -> Optional[WeatherReport]:
+    try:
+        return client.get_weather(location, units=CANONICAL_UNITS)
+    except (WeatherAppError, ValueError) as exc:
+        app.logger.warning("Weather alerts skipped %s: %s", location, exc)
+        return None
+
+
+def _alert_to_dict(alert: Alert) -> Dict[str, Any]:
+    return {
+        "rule": alert.rule.name,
+        "location": alert.location,
+        "display_name": alert.report.display_name(),
+        "field": alert.rule.field,
+        "value": alert.value,
+        "threshold": alert.rule.threshold,
+        "message": alert.message(),
+        "triggered_at": datetime.fromtimestamp(alert.triggered_at, tz=timezone.utc),
+    }
 
 
 @app.route("/")
@@ -45,6 +233,51 @@ def index() -> str:
     )
 
 
+@app.route("/icons/sprite.png")
+def icon_sprite():
+    try:
+        data, _ = _icon_sprite()
+    except WeatherAppError as exc:
+        return jsonify({"error": str(exc)}), 502
+    return _icon_response(data, _SPRITE_CACHE_CONTROL)
+
+
+@app.route("/icons/sprite.css")
+def icon_sprite_css():
+    try:
+        _, layout = _icon_sprite()
+    except WeatherAppError as exc:
+        return jsonify({"error": str(exc)}), 502
+    css = IconStore.sprite_css(layout, url="/icons/sprite.png")
+    response = app.response_class(css, mimetype="text/css")
+    response.headers["Cache-Control"] = _SPRITE_CACHE_CONTROL
+    return response
+
+
+@app.route("/icons/<code>")
+def icon(code: str):
+    code = code.removesuffix(".png")
+    try:
+        data = _icon_store.get(code)
+    except ValueError:
+        return jsonify({"error": f"Unknown icon '{code}'."}), 404
+    except WeatherAppError as exc:
+        return jsonify({"error": str(exc)}), 502
+    return _icon_response(data, _ICON_CACHE_CONTROL)
+
+
+@lru_cache(maxsize=1)
+def _icon_sprite():
+    return _icon_store.sprite()
+
+
+def _icon_response(data: bytes, cache_control: str) -> Response:
+    response = app.response_class(data, mimetype="image/png")
+    response.headers["Cache-Control"] = cache_control
+    response.add_etag()
+    return response.make_conditional(request)
+
+
 @app.route("/api/weather")
 def weather_api():
     location = request.args.get("location", "").strip()
@@ -55,20 +288,132 @@ def weather_api():
         return jsonify({"error": "Location query is required."}), 400
 
     try:
-        settings = get_settings(units=units, language=language)
+        fields = parse_fields(request.args.get("fields"))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    try:
+        with phase("settings"):
+            settings = get_settings(units=units, language=language)
+    except ConfigurationError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    client = _client_for(settings.keys())
+
+    try:
+        report = client.get_weather(
+            location, units=settings.units, language=settings.language
+        )
+    except LocationNotFoundError as exc:
+        return jsonify({"error": str(exc)}), 404
+    except WeatherAppError as exc:
+        return jsonify({"error": str(exc)}), 502
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    return _report_response(report, fields)
+
+
+@app.route("/api/weather/region")
+def region_weather_api():
+    bbox_param = request.args.get("bbox", "").strip()
+    units = request.args.get("units") or None
+    language = request.args.get("language") or None
+
+    if not bbox_param:
+        return jsonify({"error": "Bounding box is required."}), 400
+
+    try:
+        bbox = BoundingBox.parse(bbox_param)
+        zoom = int(request.args.get("zoom", 10))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    try:
+        with phase("settings"):
+            settings = get_settings(units=units, language=language)
     except ConfigurationError as exc:
         return jsonify({"error": str(exc)}), 400
 
-    client = OpenWeatherClient(settings=settings)
+    client = _client_for(settings.keys())
 
     try:
-        report = client.get_weather(location, units=units, language=language)
+        reports = client.get_region_weather(
+            bbox, zoom=zoom, units=settings.units, language=settings.language
+        )
     except WeatherAppError as exc:
         return jsonify({"error": str(exc)}), 502
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
 
-    return jsonify({"data": _serialize_report(report)})
+    with phase("serialize"):
+        data = [serialize_report(report) for report in reports]
+    return jsonify({"data": data})
+
+
+@app.route("/api/profile/summary")
+def profile_summary_api():
+    with _profile_lock:
+        profiles = list(_profile_summaries)
+
+    totals: Dict[str, Dict[str, float]] = {}
+    for profile in profiles:
+        for name, stats in profile["phases"].items():
+            entry = totals.setdefault(name, {"requests": 0, "total_ms": 0.0})
+            entry["requests"] += 1
+            entry["total_ms"] += stats["total_ms"]
+
+    phases = {
+        name: {
+            "requests": entry["requests"],
+            "mean_ms": round(entry["total_ms"] / entry["requests"], 3),
+        }
+        for name, entry in totals.items()
+    }
+    return jsonify({"profiles": profiles[::-1], "phases": phases})
+
+
+@app.route("/api/alerts")
+def alerts_api():
+    with _alert_lock:
+        config, engine = _alert_config, _alert_engine
+        active = engine.active() if engine is not None else []
+        recent = list(_recent_alerts)
+    return jsonify(
+        {
+            "enabled": _ALERTS_FILE is not None,
+            "error": _alert_error,
+            "rules": [rule.describe() for rule in config.rules] if config else [],
+            "locations": list(config.locations) if config else [],
+            "active": [{"rule": rule, "location": location} for rule, location in active],
+            "alerts": recent[::-1],
+        }
+    )
+
+
+@app.route("/api/providers")
+def providers_api():
+    try:
+        settings = get_settings()
+    except ConfigurationError as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify({"data": _client_for(settings.keys()).provider_stats()})
+
+
+@app.route("/api/keys")
+def keys_api():
+    try:
+        settings = get_settings()
+    except ConfigurationError as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify({"data": _client_for(settings.keys()).key_stats()})
+
+
+@app.cli.command("seed-icons")
+def seed_icons_command() -> None:
+    """Download every known weather icon into the local icon cache."""
+    count = _icon_store.seed()
+    print(f"Cached {count} icons in {_icon_store.directory}")
 
 
 if __name__ == "__main__":